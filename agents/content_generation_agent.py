@@ -10,14 +10,18 @@ import json
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
-import requests
 import openai
 from anthropic import Anthropic
 
 from utils.logger import get_logger
+from utils.http import get_http_session
 from utils.database import DatabaseManager
 
 
+# Thread numbering prefix such as "3/7 " at the start of a tweet line
+_TWEET_NUMBER_RE = re.compile(r'^\d+/\d+\s*')
+
+
 class ContentGenerationAgent:
     """Agent responsible for generating various types of content from trend data."""
 
@@ -27,6 +31,7 @@ class ContentGenerationAgent:
         self.db = db
         self.dry_run = dry_run
         self.logger = get_logger(__name__)
+        self.http = get_http_session()
 
         # Initialize OpenAI client with proper error handling
         self.openai_client = self._init_openai_client()
@@ -492,7 +497,8 @@ Write the complete Twitter thread now:
     
     def _parse_blog_post(self, content: str) -> Tuple[str, str]:
         """Parse blog post content to extract title and body."""
-        lines = content.strip().split('\n')
+        # Only the first few lines are inspected; keep the rest as one chunk
+        lines = content.strip().split('\n', 5)
         title = "Untitled Blog Post"
         body = content
         
@@ -513,10 +519,11 @@ Write the complete Twitter thread now:
         current_tweet = ""
         for line in lines:
             line = line.strip()
-            if re.match(r'^\d+/\d+', line):  # Tweet number format
+            number = _TWEET_NUMBER_RE.match(line)
+            if number:  # Tweet number format
                 if current_tweet:
                     tweets.append(current_tweet.strip())
-                current_tweet = re.sub(r'^\d+/\d+\s*', '', line)
+                current_tweet = line[number.end():]
             elif line:
                 current_tweet += " " + line
         
@@ -700,7 +707,7 @@ Write the complete Twitter thread now:
                 }
                 headers = {'Authorization': f'Client-ID {unsplash_key}'}
 
-                response = requests.get(url, params=params, headers=headers)
+                response = self.http.get(url, params=params, headers=headers)
                 if response.status_code == 200:
                     data = response.json()
                     for photo in data.get('results', []):
@@ -748,7 +755,8 @@ Write the complete Twitter thread now:
 
     def _parse_reddit_post(self, content: str) -> Tuple[str, str]:
         """Parse Reddit post content."""
-        lines = content.strip().split('\n')
+        # Only the first few lines are inspected; keep the rest as one chunk
+        lines = content.strip().split('\n', 3)
         title = "Reddit Post"
         body = content
 
@@ -1069,13 +1077,12 @@ Hashtags: #Travel #BudgetTravel #HiddenGems #{city.replace(' ', '')}"""
                 self.db.update_trend_status(trend_id, status)
             else:
                 # Implement basic update here
-                with self.db.get_connection() as conn:
+                with self.db.write_connection() as conn:
                     cursor = conn.cursor()
                     cursor.execute(
                         'UPDATE trends SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
                         (status, trend_id)
                     )
-                    conn.commit()
                     self.logger.info(f"Updated trend {trend_id} status to {status}")
 
         except Exception as e:
@@ -12,20 +12,27 @@ if sys.version_info >= (3, 13):
 import re
 import time
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-import tweepy
-import praw
-import requests
-from bitlyshortener import Shortener
+if TYPE_CHECKING:
+    import tweepy
+    import praw
+    from bitlyshortener import Shortener
 
 from utils.logger import get_logger
+from utils.http import get_http_session
 from utils.database import DatabaseManager
 
 
+# Thread numbering prefix such as "3/7 " at the start of a tweet line
+_TWEET_NUMBER_RE = re.compile(r'^\d+/\d+\s*')
+
+
 class PostingAgent:
     """Agent responsible for posting content to various social media platforms."""
     
@@ -35,15 +42,22 @@ class PostingAgent:
         self.db = db
         self.dry_run = dry_run
         self.logger = get_logger(__name__)
+        self.http = get_http_session()
+        
+        # Serialize API calls per platform so concurrent workers respect rate limits
+        self._platform_locks = {
+            platform: threading.Lock() for platform in ('medium', 'twitter', 'reddit')
+        }
         
         # Initialize platform clients
         self.twitter_client = self._init_twitter_client()
         self.reddit_client = self._init_reddit_client()
-        self.bitly_client = self._init_bitly_client()
+        # Dry runs leave links unshortened rather than creating real bitlinks
+        self.bitly_client = None if dry_run else self._init_bitly_client()
         
         self.logger.info(f"PostingAgent initialized {'(DRY RUN)' if dry_run else ''}")
     
-    def _init_twitter_client(self) -> Optional[tweepy.Client]:
+    def _init_twitter_client(self) -> Optional['tweepy.Client']:
         """Initialize Twitter API client."""
         try:
             api_keys = self.config.get('api_keys', {})
@@ -57,6 +71,8 @@ class PostingAgent:
                 self.logger.warning("Twitter API credentials not fully configured")
                 return None
             
+            import tweepy
+            
             client = tweepy.Client(
                 bearer_token=api_keys['twitter_bearer_token'],
                 consumer_key=api_keys['twitter_api_key'],
@@ -66,8 +82,9 @@ class PostingAgent:
                 wait_on_rate_limit=True
             )
             
-            # Test the connection
-            client.get_me()
+            # Test the connection; dry runs never call the API, so skip the round-trip
+            if not self.dry_run:
+                client.get_me()
             self.logger.info("Twitter client initialized successfully")
             return client
             
@@ -75,7 +92,7 @@ class PostingAgent:
             self.logger.error(f"Failed to initialize Twitter client: {e}")
             return None
     
-    def _init_reddit_client(self) -> Optional[praw.Reddit]:
+    def _init_reddit_client(self) -> Optional['praw.Reddit']:
         """Initialize Reddit API client."""
         try:
             api_keys = self.config.get('api_keys', {})
@@ -87,14 +104,17 @@ class PostingAgent:
                 self.logger.warning("Reddit API credentials not configured")
                 return None
             
+            import praw
+            
             reddit = praw.Reddit(
                 client_id=api_keys['reddit_client_id'],
                 client_secret=api_keys['reddit_client_secret'],
                 user_agent=api_keys['reddit_user_agent']
             )
             
-            # Test the connection
-            reddit.user.me()
+            # Test the connection; dry runs never call the API, so skip the round-trip
+            if not self.dry_run:
+                reddit.user.me()
             self.logger.info("Reddit client initialized successfully")
             return reddit
             
@@ -102,7 +122,7 @@ class PostingAgent:
             self.logger.error(f"Failed to initialize Reddit client: {e}")
             return None
     
-    def _init_bitly_client(self) -> Optional[Shortener]:
+    def _init_bitly_client(self) -> Optional['Shortener']:
         """Initialize Bitly URL shortener."""
         try:
             access_token = self.config.get('api_keys', {}).get('bitly_access_token')
@@ -110,6 +130,8 @@ class PostingAgent:
                 self.logger.warning("Bitly access token not configured")
                 return None
             
+            from bitlyshortener import Shortener
+            
             shortener = Shortener(tokens=[access_token], max_cache_size=256)
             self.logger.info("Bitly client initialized successfully")
             return shortener
@@ -125,32 +147,67 @@ class PostingAgent:
         # Get ready content
         content_items = self.db.get_ready_content(limit=limit or 5)
         posted_items = []
+        posted_content_ids = set()
+        posted_lock = threading.Lock()
+        
+        def mark_posted(content: Dict):
+            # Mark content as posted once its first platform succeeds, without
+            # waiting for the other platform queues to drain
+            with posted_lock:
+                if content['id'] in posted_content_ids:
+                    return
+                posted_content_ids.add(content['id'])
+            if self.dry_run:
+                return
+            try:
+                self.db.update_content_status(content['id'], 'posted')
+            except Exception as e:
+                self.logger.error(f"Failed to mark content {content['id']} as posted: {e}")
+        
+        # Group content by target platform so each platform can be posted to
+        # independently of the others
+        platform_queues: Dict[str, List[Dict]] = {}
+        for content in content_items:
+            for platform in self._get_target_platforms(content['content_type']):
+                platform_queues.setdefault(platform, []).append(content)
+        
+        if platform_queues:
+            # Platforms are network-bound and independent, so post to them
+            # concurrently; each worker keeps its own platform sequential
+            with ThreadPoolExecutor(max_workers=len(platform_queues)) as executor:
+                futures = [
+                    executor.submit(self._post_platform_queue, platform, items, mark_posted)
+                    for platform, items in platform_queues.items()
+                ]
+                for future in futures:
+                    for content, result in future.result():
+                        posted_items.append(result)
+        
+        self.logger.info(f"Posted {len(posted_items)} items across platforms")
+        return posted_items
+    
+    def _post_platform_queue(self, platform: str, content_items: List[Dict],
+                             on_posted: Callable[[Dict], None]) -> List[Tuple[Dict, Dict[str, Any]]]:
+        """Post content items to a single platform in order, reporting each success."""
+        results = []
         
         for content in content_items:
             try:
-                # Determine which platforms to post to
-                platforms = self._get_target_platforms(content['content_type'])
-                
-                for platform in platforms:
-                    if self._should_post_to_platform(platform):
-                        result = self._post_to_platform(content, platform)
-                        if result:
-                            posted_items.append(result)
-                            
-                            # Add delay between posts to avoid rate limiting
-                            if not self.dry_run:
-                                time.sleep(30)  # 30 second delay
-                
-                # Mark content as posted if at least one platform succeeded
-                if posted_items and not self.dry_run:
-                    self.db.update_content_status(content['id'], 'posted')
+                if self._should_post_to_platform(platform):
+                    result = self._post_to_platform(content, platform)
+                    if result:
+                        results.append((content, result))
+                        on_posted(content)
+                        
+                        # Add delay between posts to avoid rate limiting
+                        if not self.dry_run:
+                            time.sleep(30)  # 30 second delay
                 
             except Exception as e:
-                self.logger.error(f"Failed to post content {content.get('id')}: {e}")
+                self.logger.error(f"Failed to post content {content.get('id')} to {platform}: {e}")
                 continue
         
-        self.logger.info(f"Posted {len(posted_items)} items across platforms")
-        return posted_items
+        return results
     
     def _get_target_platforms(self, content_type: str) -> List[str]:
         """Get target platforms for content type."""
@@ -176,25 +233,27 @@ class PostingAgent:
         """Check if we should post to a platform based on rate limits."""
         # Simple rate limiting - check posts in last hour
         try:
-            recent_posts = self.db.get_recent_posts(platform, hours=1)
+            recent_count = self.db.get_recent_post_count(platform, hours=1)
             max_posts_per_hour = self.config.get('automation', {}).get('rate_limits', {}).get('posts_per_hour', 2)
             
-            return len(recent_posts) < max_posts_per_hour
+            return recent_count < max_posts_per_hour
         except:
             return True  # Default to allowing posts
     
     def _post_to_platform(self, content: Dict, platform: str) -> Optional[Dict[str, Any]]:
         """Post content to a specific platform."""
         try:
-            if platform == 'medium':
-                return self._post_to_medium(content)
-            elif platform == 'twitter':
-                return self._post_to_twitter(content)
-            elif platform == 'reddit':
-                return self._post_to_reddit(content)
-            else:
+            if platform not in self._platform_locks:
                 self.logger.warning(f"Unknown platform: {platform}")
                 return None
+            
+            with self._platform_locks[platform]:
+                if platform == 'medium':
+                    return self._post_to_medium(content)
+                elif platform == 'twitter':
+                    return self._post_to_twitter(content)
+                else:
+                    return self._post_to_reddit(content)
                 
         except Exception as e:
             self.logger.error(f"Failed to post to {platform}: {e}")
@@ -229,7 +288,7 @@ class PostingAgent:
             }
             
             # Get user ID first
-            user_response = requests.get('https://api.medium.com/v1/me', headers=headers)
+            user_response = self.http.get('https://api.medium.com/v1/me', headers=headers)
             if user_response.status_code != 200:
                 raise Exception(f"Failed to get Medium user: {user_response.text}")
             
@@ -244,7 +303,7 @@ class PostingAgent:
                 'publishStatus': 'public'
             }
             
-            post_response = requests.post(
+            post_response = self.http.post(
                 f'https://api.medium.com/v1/users/{user_id}/posts',
                 headers=headers,
                 json=post_data
@@ -292,22 +351,23 @@ class PostingAgent:
                 self.logger.info(f"DRY RUN: Would post Twitter thread with {len(tweets)} tweets")
                 return {'platform': 'twitter', 'tweets': len(tweets), 'status': 'dry_run'}
             
-            # Post thread
+            # Add hashtags to last tweet
+            hashtags = self.config.get('social_platforms', {}).get('twitter', {}).get('hashtags', [])
+            if hashtags:
+                tweets[-1] += f" {' '.join(hashtags[:3])}"  # Max 3 hashtags
+            
+            # Ensure tweets are under 280 characters
+            tweets = [t if len(t) <= 280 else t[:277] + "..." for t in tweets]
+            
+            # Post thread; each tweet replies to the previous one, so the
+            # chain has to stay sequential
             thread_ids = []
             reply_to_id = None
+            create_tweet = self.twitter_client.create_tweet
+            last_index = len(tweets) - 1
             
             for i, tweet_text in enumerate(tweets):
-                # Add hashtags to last tweet
-                if i == len(tweets) - 1:
-                    hashtags = self.config.get('social_platforms', {}).get('twitter', {}).get('hashtags', [])
-                    if hashtags:
-                        tweet_text += f" {' '.join(hashtags[:3])}"  # Max 3 hashtags
-                
-                # Ensure tweet is under 280 characters
-                if len(tweet_text) > 280:
-                    tweet_text = tweet_text[:277] + "..."
-                
-                response = self.twitter_client.create_tweet(
+                response = create_tweet(
                     text=tweet_text,
                     in_reply_to_tweet_id=reply_to_id
                 )
@@ -317,7 +377,8 @@ class PostingAgent:
                 reply_to_id = tweet_id
                 
                 # Small delay between tweets
-                time.sleep(2)
+                if i < last_index:
+                    time.sleep(2)
             
             # Save post record
             post_id = self.db.insert_post(content['id'], 'twitter')
@@ -410,10 +471,11 @@ class PostingAgent:
                 continue
 
             # Check for tweet number format (1/7, 2/7, etc.)
-            if re.match(r'^\d+/\d+', line):
+            number = _TWEET_NUMBER_RE.match(line)
+            if number:
                 if current_tweet:
                     tweets.append(current_tweet.strip())
-                current_tweet = re.sub(r'^\d+/\d+\s*', '', line)
+                current_tweet = line[number.end():]
             else:
                 current_tweet += " " + line
 
@@ -511,20 +573,34 @@ class PostingAgent:
         try:
             # Get posts scheduled for now (within 5 minutes)
             current_time = datetime.now()
-            scheduled_posts = self.db.get_scheduled_posts()
-
-            for post in scheduled_posts:
-                scheduled_time = datetime.fromisoformat(post['scheduled_at'])
-                if scheduled_time <= current_time:
-                    # Get content and post it
-                    content = self.db.get_content_by_id(post['content_id'])
-                    if content:
-                        result = self._post_to_platform(content, post['platform'])
-                        if result:
-                            self.logger.info(f"Posted scheduled content: {post['id']}")
-                        else:
-                            self.db.update_post_status(post['id'], 'failed',
-                                                     error_message="Failed to post scheduled content")
+            due_posts = [
+                post for post in self.db.iter_scheduled_posts()
+                if datetime.fromisoformat(post['scheduled_at']) <= current_time
+            ]
+            
+            if not due_posts:
+                return
+            
+            # Posts are independent; per-platform locks keep API calls to the
+            # same platform serialized
+            with ThreadPoolExecutor(max_workers=min(4, len(due_posts))) as executor:
+                list(executor.map(self._process_scheduled_post, due_posts))
 
         except Exception as e:
             self.logger.error(f"Failed to process scheduled posts: {e}")
+    
+    def _process_scheduled_post(self, post: Dict):
+        """Post a single scheduled post's content."""
+        try:
+            # Get content and post it
+            content = self.db.get_content_by_id(post['content_id'])
+            if content:
+                result = self._post_to_platform(content, post['platform'])
+                if result:
+                    self.logger.info(f"Posted scheduled content: {post['id']}")
+                else:
+                    self.db.update_post_status(post['id'], 'failed',
+                                             error_message="Failed to post scheduled content")
+        
+        except Exception as e:
+            self.logger.error(f"Failed to process scheduled post {post.get('id')}: {e}")
@@ -3,16 +3,22 @@ Tracking Agent
 Collects performance metrics and provides AI-powered optimization suggestions.
 """
 
-import requests
+import re
+import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import openai
 from anthropic import Anthropic
 
 from utils.logger import get_logger
+from utils.http import get_http_session
 from utils.database import DatabaseManager
 
 
+# Numbered or bulleted list line in an AI response, without surrounding whitespace
+_LIST_ITEM_RE = re.compile(r'^[^\S\n]*([\d•-][^\n]*?)[^\S\n]*$', re.MULTILINE)
+
+
 class TrackingAgent:
     """Agent responsible for tracking performance and providing optimization insights."""
     
@@ -22,6 +28,7 @@ class TrackingAgent:
         self.db = db
         self.dry_run = dry_run
         self.logger = get_logger(__name__)
+        self.http = get_http_session()
         
         # Initialize AI client for optimization suggestions
         self.ai_client = self._init_ai_client()
@@ -105,7 +112,7 @@ class TrackingAgent:
             headers = {'Authorization': f'Bearer {access_token}'}
             
             # Get user's links
-            response = requests.get(
+            response = self.http.get(
                 'https://api-ssl.bitly.com/v4/user/bitlinks',
                 headers=headers,
                 params={'size': 50}  # Get last 50 links
@@ -118,7 +125,7 @@ class TrackingAgent:
                     link_id = link['id']
                     
                     # Get click metrics for each link
-                    clicks_response = requests.get(
+                    clicks_response = self.http.get(
                         f'https://api-ssl.bitly.com/v4/bitlinks/{link_id}/clicks/summary',
                         headers=headers,
                         params={'unit': 'day', 'units': 30}
@@ -183,11 +190,13 @@ class TrackingAgent:
             # Get performance summary from database
             summary = self.db.get_performance_summary(days=30)
             
-            # Get content statistics
-            content_stats = self._get_content_statistics()
-            
-            # Get posting frequency
-            posting_stats = self._get_posting_statistics()
+            # Content and posting statistics share one connection
+            with self.db.read_connection() as conn:
+                # Get content statistics
+                content_stats = self._get_content_statistics(conn)
+                
+                # Get posting frequency
+                posting_stats = self._get_posting_statistics(conn)
             
             return {
                 'performance_summary': summary,
@@ -199,84 +208,100 @@ class TrackingAgent:
             self.logger.error(f"Failed to collect database metrics: {e}")
             return {}
     
-    def _get_content_statistics(self) -> Dict[str, Any]:
+    def _get_content_statistics(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Get content creation and quality statistics."""
         try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Content by type
-                cursor.execute('''
-                    SELECT content_type, COUNT(*) as count, AVG(quality_score) as avg_quality
-                    FROM content 
-                    WHERE created_at >= date('now', '-30 days')
-                    GROUP BY content_type
-                ''')
-                content_by_type = [dict(row) for row in cursor.fetchall()]
-                
-                # Content by status
-                cursor.execute('''
-                    SELECT status, COUNT(*) as count
-                    FROM content 
-                    WHERE created_at >= date('now', '-30 days')
-                    GROUP BY status
-                ''')
-                content_by_status = [dict(row) for row in cursor.fetchall()]
-                
-                # Top performing content
-                cursor.execute('''
-                    SELECT c.title, c.content_type, c.quality_score, 
-                           COUNT(p.id) as post_count
-                    FROM content c
-                    LEFT JOIN posts p ON c.id = p.content_id
-                    WHERE c.created_at >= date('now', '-30 days')
-                    GROUP BY c.id
-                    ORDER BY c.quality_score DESC, post_count DESC
-                    LIMIT 10
-                ''')
-                top_content = [dict(row) for row in cursor.fetchall()]
-                
-                return {
-                    'by_type': content_by_type,
-                    'by_status': content_by_status,
-                    'top_performing': top_content
+            cursor = conn.cursor()
+            
+            # Content by type and by status, from one scan of the window
+            cursor.execute('''
+                SELECT content_type, status, COUNT(*) as count,
+                       SUM(quality_score) as quality_total,
+                       COUNT(quality_score) as quality_count
+                FROM content 
+                WHERE created_at >= date('now', '-30 days')
+                GROUP BY content_type, status
+            ''')
+            
+            type_totals = {}
+            status_counts = {}
+            for row in cursor.fetchall():
+                totals = type_totals.setdefault(row['content_type'], [0, 0.0, 0])
+                totals[0] += row['count']
+                totals[1] += row['quality_total'] or 0.0
+                totals[2] += row['quality_count']
+                status_counts[row['status']] = status_counts.get(row['status'], 0) + row['count']
+            
+            content_by_type = [
+                {
+                    'content_type': content_type,
+                    'count': count,
+                    'avg_quality': quality_total / quality_count if quality_count else None
                 }
-                
+                for content_type, (count, quality_total, quality_count) in sorted(type_totals.items())
+            ]
+            content_by_status = [
+                {'status': status, 'count': count}
+                for status, count in sorted(status_counts.items(), key=lambda item: (item[0] is not None, item[0] or ''))
+            ]
+            
+            # Top performing content
+            cursor.execute('''
+                SELECT c.title, c.content_type, c.quality_score, 
+                       COUNT(p.id) as post_count
+                FROM content c
+                LEFT JOIN posts p ON c.id = p.content_id
+                WHERE c.created_at >= date('now', '-30 days')
+                GROUP BY c.id
+                ORDER BY c.quality_score DESC, post_count DESC
+                LIMIT 10
+            ''')
+            top_content = [dict(row) for row in cursor.fetchall()]
+            
+            return {
+                'by_type': content_by_type,
+                'by_status': content_by_status,
+                'top_performing': top_content
+            }
+            
         except Exception as e:
             self.logger.error(f"Failed to get content statistics: {e}")
             return {}
     
-    def _get_posting_statistics(self) -> Dict[str, Any]:
+    def _get_posting_statistics(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Get posting frequency and success rate statistics."""
         try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Posts by platform
-                cursor.execute('''
-                    SELECT platform, COUNT(*) as count, 
-                           SUM(CASE WHEN status = 'posted' THEN 1 ELSE 0 END) as successful
-                    FROM posts 
-                    WHERE created_at >= date('now', '-30 days')
-                    GROUP BY platform
-                ''')
-                posts_by_platform = [dict(row) for row in cursor.fetchall()]
-                
-                # Daily posting frequency
-                cursor.execute('''
-                    SELECT DATE(created_at) as date, COUNT(*) as posts
-                    FROM posts 
-                    WHERE created_at >= date('now', '-30 days')
-                    GROUP BY DATE(created_at)
-                    ORDER BY date DESC
-                ''')
-                daily_posts = [dict(row) for row in cursor.fetchall()]
-                
-                return {
-                    'by_platform': posts_by_platform,
-                    'daily_frequency': daily_posts
-                }
-                
+            cursor = conn.cursor()
+            
+            # Both breakdowns read the trigger-maintained daily rollup
+            # instead of re-aggregating the posts table
+            
+            # Posts by platform
+            cursor.execute('''
+                SELECT platform, SUM(posts) as count, SUM(successful) as successful
+                FROM daily_post_stats
+                WHERE date >= date('now', '-30 days')
+                GROUP BY platform
+                HAVING SUM(posts) > 0
+            ''')
+            posts_by_platform = [dict(row) for row in cursor.fetchall()]
+            
+            # Daily posting frequency
+            cursor.execute('''
+                SELECT date, SUM(posts) as posts
+                FROM daily_post_stats
+                WHERE date >= date('now', '-30 days')
+                GROUP BY date
+                HAVING SUM(posts) > 0
+                ORDER BY date DESC
+            ''')
+            daily_posts = [dict(row) for row in cursor.fetchall()]
+            
+            return {
+                'by_platform': posts_by_platform,
+                'daily_frequency': daily_posts
+            }
+            
         except Exception as e:
             self.logger.error(f"Failed to get posting statistics: {e}")
             return {}
@@ -437,16 +462,13 @@ Format as numbered list:
     def _parse_optimization_suggestions(self, ai_response: str) -> List[str]:
         """Parse optimization suggestions from AI response."""
         suggestions = []
-        lines = ai_response.strip().split('\n')
 
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                # Remove numbering and clean up
-                suggestion = line.split('.', 1)[-1].strip()
-                suggestion = suggestion.lstrip('- •').strip()
-                if suggestion and len(suggestion) > 20:  # Ensure it's substantial
-                    suggestions.append(suggestion)
+        for match in _LIST_ITEM_RE.finditer(ai_response):
+            # Remove numbering and clean up
+            suggestion = match.group(1).split('.', 1)[-1].strip()
+            suggestion = suggestion.lstrip('- •').strip()
+            if suggestion and len(suggestion) > 20:  # Ensure it's substantial
+                suggestions.append(suggestion)
 
         return suggestions[:7]  # Limit to 7 suggestions
 
@@ -517,7 +539,7 @@ Format as numbered list:
         try:
             # Save summary to performance_summary table
             summary = report['summary']
-            with self.db.get_connection() as conn:
+            with self.db.write_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO performance_summary
@@ -534,7 +556,6 @@ Format as numbered list:
                     summary.get('click_rate', 0),
                     summary.get('conversion_rate', 0)
                 ))
-                conn.commit()
 
             self.logger.info("Performance report saved to database")
 
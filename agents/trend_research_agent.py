@@ -3,19 +3,24 @@ Trend Research Agent
 Fetches travel trends via Google Trends API and generates content ideas using AI.
 """
 
+import re
 import random
 import time
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from pytrends.request import TrendReq
-import openai
-from anthropic import Anthropic
 
 from utils.logger import get_logger
 from utils.database import DatabaseManager
 
 
+# Number of content ideas requested from the AI per city
+_MAX_CONTENT_IDEAS = 8
+
+# Numbered or bulleted list line in an AI response, without surrounding whitespace
+_LIST_ITEM_RE = re.compile(r'^[^\S\n]*([\d•-][^\n]*?)[^\S\n]*$', re.MULTILINE)
+
+
 class TrendResearchAgent:
     """Agent responsible for researching travel trends and generating content ideas."""
 
@@ -42,6 +47,7 @@ class TrendResearchAgent:
     def _init_pytrends(self):
         """Initialize Google Trends with error handling."""
         try:
+            from pytrends.request import TrendReq
             self.pytrends = TrendReq(hl='en-US', tz=360, timeout=(10, 25), retries=2, backoff_factor=0.1)
             self.logger.info("✅ Google Trends API initialized successfully")
         except Exception as e:
@@ -56,6 +62,7 @@ class TrendResearchAgent:
         openai_config = ai_config.get('openai', {})
         if openai_config.get('api_key'):
             try:
+                import openai
                 openai.api_key = openai_config['api_key']
                 # Test the connection with a simple request
                 openai.Model.list()
@@ -68,6 +75,7 @@ class TrendResearchAgent:
         anthropic_config = ai_config.get('anthropic', {})
         if anthropic_config.get('api_key') and anthropic_config.get('enabled', False):
             try:
+                from anthropic import Anthropic
                 client = Anthropic(api_key=anthropic_config['api_key'])
                 self.logger.info("✅ Anthropic API client initialized")
                 return client
@@ -92,10 +100,13 @@ class TrendResearchAgent:
         cities_to_research = random.sample(target_cities, min(3, len(target_cities)))
         self.logger.info(f"🏙️ Researching trends for cities: {', '.join(cities_to_research)}")
 
+        # One timestamp for the whole research run
+        research_date = datetime.now().isoformat()
+
         for city in cities_to_research:
             try:
                 self.logger.info(f"🔎 Researching trends for {city}...")
-                trend_data = self._fetch_city_trends(city)
+                trend_data = self._fetch_city_trends(city, research_date)
 
                 if trend_data:
                     content_ideas = self._generate_content_ideas(city, trend_data)
@@ -108,19 +119,10 @@ class TrendResearchAgent:
                         'content_ideas': content_ideas,
                         'keywords': keywords,
                         'scores': scores,
-                        'research_date': datetime.now().isoformat()
+                        'research_date': research_date
                     }
 
-                    if not self.dry_run:
-                        trend_id = self.db.insert_trend(
-                            city=city,
-                            trend_data=trend_data,
-                            content_ideas=content_ideas,
-                            keywords=keywords
-                        )
-                        result['id'] = trend_id
-                        self.logger.info(f"💾 Saved trend data for {city} (ID: {trend_id})")
-                    else:
+                    if self.dry_run:
                         self.logger.info(f"🧪 DRY RUN: Would save trend for {city}")
 
                     trends_found.append(result)
@@ -135,10 +137,20 @@ class TrendResearchAgent:
                 self.logger.error(f"❌ Failed to research trends for {city}: {e}")
                 continue
 
+        # Save all researched cities in one transaction
+        if trends_found and not self.dry_run:
+            try:
+                trend_ids = self.db.insert_trends(trends_found)
+                for result, trend_id in zip(trends_found, trend_ids):
+                    result['id'] = trend_id
+                    self.logger.info(f"💾 Saved trend data for {result['city']} (ID: {trend_id})")
+            except Exception as e:
+                self.logger.error(f"❌ Failed to save trend data: {e}")
+
         self.logger.info(f"🎯 Trend research completed! Found {len(trends_found)} city trends with {sum(len(t.get('content_ideas', [])) for t in trends_found)} total content ideas")
         return trends_found
 
-    def _fetch_city_trends(self, city: str) -> Optional[Dict[str, Any]]:
+    def _fetch_city_trends(self, city: str, research_date: str = None) -> Optional[Dict[str, Any]]:
         """Fetch Google Trends data for a specific city with retry logic."""
         if not self.pytrends:
             self.logger.error("❌ Google Trends client not available")
@@ -180,7 +192,7 @@ class TrendResearchAgent:
                     'interest_over_time': self._process_dataframe(interest_over_time),
                     'related_queries': self._process_related_queries(related_queries),
                     'regional_interest': self._process_dataframe(regional_interest),
-                    'research_date': datetime.now().isoformat(),
+                    'research_date': research_date or datetime.now().isoformat(),
                     'timeframe': 'today 3-m'
                 }
 
@@ -230,15 +242,11 @@ class TrendResearchAgent:
             if data is not None:
                 processed[query] = {}
 
-                # Process 'top' queries
-                if 'top' in data and data['top'] is not None and not data['top'].empty:
-                    top_queries = data['top'].head(10)
-                    processed[query]['top'] = top_queries.to_dict('records')
-
-                # Process 'rising' queries
-                if 'rising' in data and data['rising'] is not None and not data['rising'].empty:
-                    rising_queries = data['rising'].head(10)
-                    processed[query]['rising'] = rising_queries.to_dict('records')
+                # Process 'top' and 'rising' queries, keeping the first 10 rows
+                for kind in ('top', 'rising'):
+                    frame = data.get(kind)
+                    if frame is not None and not frame.empty:
+                        processed[query][kind] = frame.iloc[:10].to_dict('records')
 
         return processed
 
@@ -253,14 +261,9 @@ class TrendResearchAgent:
 
             if isinstance(self.ai_client, str) and self.ai_client == 'openai':
                 # Use the new OpenAI API format
+                import openai
                 client = openai.OpenAI(api_key=openai.api_key)
-                response = client.chat.completions.create(
-                    model=self.config.get('ai', {}).get('openai', {}).get('model', 'gpt-4o-mini'),
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=self.config.get('ai', {}).get('openai', {}).get('max_tokens', 1500),
-                    temperature=self.config.get('ai', {}).get('openai', {}).get('temperature', 0.7)
-                )
-                content = response.choices[0].message.content
+                content = self._stream_openai_ideas(client, prompt)
             else:
                 # Anthropic
                 response = self.ai_client.messages.create(
@@ -279,6 +282,49 @@ class TrendResearchAgent:
             self.logger.error(f"❌ Failed to generate AI content ideas for {city}: {e}")
             return self._get_fallback_content_ideas(city)
 
+    def _stream_openai_ideas(self, client, prompt: str) -> str:
+        """Stream an OpenAI completion, stopping once a full set of ideas has arrived."""
+        openai_config = self.config.get('ai', {}).get('openai', {})
+        stream = client.chat.completions.create(
+            model=openai_config.get('model', 'gpt-4o-mini'),
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=openai_config.get('max_tokens', 1500),
+            temperature=openai_config.get('temperature', 0.7),
+            stream=True
+        )
+
+        lines = []
+        partial = ''
+        idea_count = 0
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+
+                # Ideas arrive one per line; each line is parsed once, as soon
+                # as it is complete
+                *completed, partial = (partial + delta).split('\n')
+                for line in completed:
+                    lines.append(line)
+                    idea = self._parse_list_item(line)
+                    if idea and self._is_quality_idea(idea):
+                        idea_count += 1
+
+                # Only list items count, so stopping here cannot change what
+                # the full response parses to: once the numbered format
+                # matched, _parse_content_ideas never uses its fallback
+                if idea_count >= _MAX_CONTENT_IDEAS:
+                    self.logger.debug("Received a full set of content ideas, closing stream early")
+                    return '\n'.join(lines)
+        finally:
+            stream.close()
+
+        lines.append(partial)
+        return '\n'.join(lines)
+
     def _build_content_ideas_prompt(self, city: str, trend_data: Dict) -> str:
         """Build comprehensive prompt for AI content idea generation."""
 
@@ -303,10 +349,14 @@ class TrendResearchAgent:
         else:
             season = "fall"
 
+        idea_slots = '\n'.join(
+            f"{number}. [Specific Content Idea Title]" for number in range(1, _MAX_CONTENT_IDEAS + 1)
+        )
+
         prompt = f"""
 You are an expert travel content strategist specializing in Booking.com affiliate marketing for accommodation bookings.
 
-Generate 8 highly engaging and specific content ideas for {city} that will drive hotel bookings through affiliate links.
+Generate {_MAX_CONTENT_IDEAS} highly engaging and specific content ideas for {city} that will drive hotel bookings through affiliate links.
 
 CONTEXT:
 - Target City: {city}
@@ -330,14 +380,7 @@ CONTENT TYPES TO INCLUDE:
 - Experience-based hotel selections (romantic, family, business, solo)
 
 FORMAT YOUR RESPONSE EXACTLY AS:
-1. [Specific Content Idea Title]
-2. [Specific Content Idea Title]
-3. [Specific Content Idea Title]
-4. [Specific Content Idea Title]
-5. [Specific Content Idea Title]
-6. [Specific Content Idea Title]
-7. [Specific Content Idea Title]
-8. [Specific Content Idea Title]
+{idea_slots}
 
 EXAMPLES OF EXCELLENT IDEAS:
 - "7 Boutique Hotels in {city} Under $120/Night Perfect for {season} 2025"
@@ -349,33 +392,50 @@ Generate content ideas that will convert browsers into bookers:
 """
         return prompt
 
+    @staticmethod
+    def _clean_list_item(line: str) -> Optional[str]:
+        """Strip numbering, bullets and quotes from a list item; None if too short."""
+        # Remove numbering and clean up
+        idea = line.split('.', 1)[-1].strip() if '.' in line else line
+        idea = idea.lstrip('- •').strip()
+        idea = idea.strip('"\'')  # Remove quotes
+
+        if idea and len(idea) > 15:  # Ensure it's a substantial idea
+            return idea
+        return None
+
+    @classmethod
+    def _parse_list_item(cls, line: str) -> Optional[str]:
+        """Parse one response line as a numbered or bulleted content idea."""
+        match = _LIST_ITEM_RE.match(line)
+        return cls._clean_list_item(match.group(1)) if match else None
+
+    @staticmethod
+    def _is_quality_idea(idea: str) -> bool:
+        """Check whether an idea is substantial and about accommodation."""
+        lowered = idea.lower()
+        return len(idea) > 20 and ('hotel' in lowered or 'stay' in lowered or 'accommodation' in lowered)
+
     def _parse_content_ideas(self, ai_response: str) -> List[str]:
         """Parse content ideas from AI response with improved extraction."""
         ideas = []
-        lines = ai_response.strip().split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                # Remove numbering and clean up
-                idea = line.split('.', 1)[-1].strip() if '.' in line else line
-                idea = idea.lstrip('- •').strip()
-                idea = idea.strip('"\'')  # Remove quotes
 
-                if idea and len(idea) > 15:  # Ensure it's a substantial idea
-                    ideas.append(idea)
+        for match in _LIST_ITEM_RE.finditer(ai_response):
+            idea = self._clean_list_item(match.group(1))
+            if idea:
+                ideas.append(idea)
 
         # Fallback parsing if numbered format failed
         if not ideas:
-            for line in lines:
+            for line in ai_response.strip().split('\n'):
                 line = line.strip()
                 if line and len(line) > 15 and not line.startswith(('Generate', 'You are', 'CONTENT', 'FORMAT')):
                     ideas.append(line.strip('"\''))
 
         # Ensure we have quality ideas
-        filtered_ideas = [idea for idea in ideas if len(idea) > 20 and 'hotel' in idea.lower() or 'stay' in idea.lower() or 'accommodation' in idea.lower()]
+        filtered_ideas = [idea for idea in ideas if self._is_quality_idea(idea)]
 
-        return filtered_ideas[:8]  # Return up to 8 ideas
+        return filtered_ideas[:_MAX_CONTENT_IDEAS]
 
     def _extract_keywords(self, city: str, trend_data: Dict) -> List[str]:
         """Extract relevant keywords from trend data with better filtering."""
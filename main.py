@@ -6,66 +6,97 @@ Automated content generation and posting system for affiliate marketing.
 
 import argparse
 import logging
+import os
+import signal
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-import schedule
-import time
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
 from utils.database import DatabaseManager
-from utils.logger import setup_logging
-from agents.trend_research_agent import TrendResearchAgent
-from agents.content_generation_agent import ContentGenerationAgent
-from agents.posting_agent import PostingAgent
-from agents.tracking_agent import TrackingAgent
+from utils.logger import setup_logging, shutdown_logging
 
 # Configure logging
 logger = setup_logging()
 
+# Lazily built agent attributes on AffiliateBot
+_AGENT_ATTRS = ('trend_agent', 'content_agent', 'posting_agent', 'tracking_agent')
+
 class AffiliateBot:
     def __init__(self, dry_run: bool = False):
         self.dry_run = dry_run
         
         # Initialize managers
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
         self.config = self.config_manager.get_config()
         
         db_path = self.config.get('database', {}).get('path', 'data/airbnb_bot.db')
         self.db = DatabaseManager(db_path)
-        
-        # Initialize agents
-        self.trend_agent = TrendResearchAgent(self.config, self.db, self.dry_run)
-        self.content_agent = ContentGenerationAgent(self.config, self.db, self.dry_run)
-        self.posting_agent = PostingAgent(self.config, self.db, self.dry_run)
-        self.tracking_agent = TrackingAgent(self.config, self.db, self.dry_run)
 
-        # Ensure logs directory exists
-        Path('logs').mkdir(exist_ok=True)
+    # Agents are built on first use so single-command runs only pay for the
+    # agent they need. Agent modules pull in the API client libraries, so
+    # they are imported here rather than at module level.
+    @cached_property
+    def trend_agent(self):
+        """Trend research agent, built on first access"""
+        from agents.trend_research_agent import TrendResearchAgent
+        return TrendResearchAgent(self.config, self.db, self.dry_run)
+
+    @cached_property
+    def content_agent(self):
+        """Content generation agent, built on first access"""
+        from agents.content_generation_agent import ContentGenerationAgent
+        return ContentGenerationAgent(self.config, self.db, self.dry_run)
+
+    @cached_property
+    def posting_agent(self):
+        """Social posting agent, built on first access"""
+        from agents.posting_agent import PostingAgent
+        return PostingAgent(self.config, self.db, self.dry_run)
+
+    @cached_property
+    def tracking_agent(self):
+        """Performance tracking agent, built on first access"""
+        from agents.tracking_agent import TrackingAgent
+        return TrackingAgent(self.config, self.db, self.dry_run)
+
+    def _warm_agents(self):
+        """Construct any agents not yet built, concurrently"""
+        # Agent construction is dominated by independent SDK imports and API
+        # client setup, so overlap it when a run needs several agents
+        missing = [name for name in _AGENT_ATTRS if name not in self.__dict__]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                list(executor.map(lambda name: getattr(self, name), missing))
 
     def run_trend_research(self):
         """Research new trends and content ideas"""
         logger.info("🔍 Starting trend research...")
         try:
             trends = self.trend_agent.research_trends()
-            logger.info(f"✅ Found {len(trends)} new trends/ideas")
-            for trend in trends:
-                logger.info(f"  • {trend.get('city')}: {len(trend.get('content_ideas', []))} ideas")
+            # One record for the whole summary rather than one per trend
+            lines = [f"\n  • {trend.get('city')}: {len(trend.get('content_ideas', []))} ideas" for trend in trends]
+            logger.info("✅ Found %d new trends/ideas%s", len(trends), "".join(lines))
         except Exception as e:
-            logger.error(f"❌ Trend research failed: {e}", exc_info=True)
+            logger.error("❌ Trend research failed: %s", e, exc_info=True)
 
     def run_content_generation(self):
         """Generate content from pending trends"""
         logger.info("✍️ Starting content generation...")
         try:
             content_pieces = self.content_agent.generate_content()
-            logger.info(f"✅ Generated {len(content_pieces)} content pieces")
-            for content in content_pieces:
-                logger.info(f"  • {content.get('content_type')}: {content.get('title', 'N/A')[:60]}...")
+            lines = [f"\n  • {content.get('content_type')}: {str(content.get('title', 'N/A'))[:60]}..."
+                     for content in content_pieces]
+            logger.info("✅ Generated %d content pieces%s", len(content_pieces), "".join(lines))
         except Exception as e:
-            logger.error(f"❌ Content generation failed: {e}", exc_info=True)
+            logger.error("❌ Content generation failed: %s", e, exc_info=True)
 
     def run_posting(self):
         """Post unpublished content to social platforms"""
@@ -75,11 +106,11 @@ class AffiliateBot:
             successful = [r for r in results if r.get('status') == 'posted' or r.get('status') == 'dry_run']
             failed = [r for r in results if r.get('status') not in ['posted', 'dry_run']]
 
-            logger.info(f"✅ Successfully posted {len(successful)} items")
+            logger.info("✅ Successfully posted %d items", len(successful))
             if failed:
-                logger.warning(f"⚠️ {len(failed)} posts failed")
+                logger.warning("⚠️ %d posts failed", len(failed))
         except Exception as e:
-            logger.error(f"❌ Posting failed: {e}", exc_info=True)
+            logger.error("❌ Posting failed: %s", e, exc_info=True)
 
     def run_analytics_update(self):
         """Update analytics data from tracking sources"""
@@ -87,33 +118,67 @@ class AffiliateBot:
         try:
             report = self.tracking_agent.analyze_performance()
             summary = report.get('summary', {})
-            logger.info(f"📈 Analytics summary: "
-                        f"Grade: {summary.get('performance_grade', 'N/A')}, "
-                        f"Revenue: ${summary.get('estimated_revenue', 0):.2f}, "
-                        f"Clicks: {summary.get('total_clicks', 0)}")
+            logger.info("📈 Analytics summary: Grade: %s, Revenue: $%.2f, Clicks: %s",
+                        summary.get('performance_grade', 'N/A'),
+                        summary.get('estimated_revenue', 0),
+                        summary.get('total_clicks', 0))
         except Exception as e:
-            logger.error(f"❌ Analytics update failed: {e}", exc_info=True)
+            logger.error("❌ Analytics update failed: %s", e, exc_info=True)
 
     def run_full_cycle(self):
         """Run complete automation cycle"""
         logger.info("🚀 Starting full automation cycle...")
+        self._warm_agents()
+        # Each phase commits its results before returning, and API pacing is
+        # handled inside the agents, so the phases run back to back
         self.run_trend_research()
-        time.sleep(5)
         self.run_content_generation()
-        time.sleep(5)
-        self.run_posting()
-        time.sleep(5)
-        self.run_analytics_update()
+        
+        # Posting and the analytics refresh don't depend on each other and are
+        # both network-bound, so overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(self.run_posting)
+            executor.submit(self.run_analytics_update)
         logger.info("✨ Full cycle completed!")
 
     def start_scheduler(self):
         """Start the scheduled automation"""
+        # Only the long-running scheduler needs the schedule library
+        import schedule
+        
         logger.info("⏰ Starting scheduler...")
         
-        schedule.every().day.at("06:00").do(self.run_trend_research)
-        schedule.every().day.at("08:00").do(self.run_content_generation)
-        schedule.every(4).hours.do(self.run_posting) # Post every 4 hours
-        schedule.every().day.at("22:00").do(self.run_analytics_update)
+        # Jobs are handed to worker threads so a long run never delays the
+        # next job's fire time
+        executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="job")
+        
+        def exclusive(job):
+            # At most one run of each job at a time: a firing that comes due
+            # while the previous run is still going is skipped, not queued
+            running = threading.Lock()
+            
+            def run():
+                try:
+                    job()
+                finally:
+                    running.release()
+            
+            def submit():
+                if not running.acquire(blocking=False):
+                    logger.warning("⏭️ Skipping %s: previous run still in progress", job.__name__)
+                    return
+                try:
+                    executor.submit(run)
+                except RuntimeError:
+                    running.release()
+                    raise
+            
+            return submit
+        
+        schedule.every().day.at("06:00").do(exclusive(self.run_trend_research))
+        schedule.every().day.at("08:00").do(exclusive(self.run_content_generation))
+        schedule.every(4).hours.do(exclusive(self.run_posting)) # Post every 4 hours
+        schedule.every().day.at("22:00").do(exclusive(self.run_analytics_update))
 
         logger.info("📅 Scheduled jobs:")
         logger.info("  • 06:00 - Trend Research")
@@ -121,17 +186,49 @@ class AffiliateBot:
         logger.info("  • Every 4 hours - Content Posting")
         logger.info("  • 22:00 - Analytics Update")
 
+        # SIGTERM wakes the loop immediately instead of after the current sleep
+        stop = threading.Event()
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
         try:
-            while True:
+            while not stop.is_set():
                 schedule.run_pending()
-                time.sleep(60)
+                # Sleep until the next job is due instead of polling every minute
+                idle = schedule.idle_seconds()
+                stop.wait(timeout=max(1, idle) if idle is not None else 60)
+            logger.info("🛑 Scheduler stopped by SIGTERM")
         except KeyboardInterrupt:
             logger.info("🛑 Scheduler stopped by user")
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            # Let running jobs finish, drop any that have not started
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @contextmanager
+    def dry_run_scope(self):
+        """Force dry-run mode on the bot and its agents for the duration of the block"""
+        previous = self.dry_run
+        built = {name: self.__dict__[name] for name in _AGENT_ATTRS if name in self.__dict__}
+        self.dry_run = True
+        for agent in built.values():
+            agent.dry_run = True
+        try:
+            yield
+        finally:
+            self.dry_run = previous
+            for agent in built.values():
+                agent.dry_run = previous
+            # Agents first built inside the scope skipped their live API client
+            # setup, so drop them and let the next access rebuild them
+            for name in _AGENT_ATTRS:
+                if name not in built:
+                    self.__dict__.pop(name, None)
 
     def test_mode(self):
         """Run in test mode without posting"""
         logger.info("🧪 Running in test mode (dry run)...")
-        self.run_full_cycle()
+        with self.dry_run_scope():
+            self.run_full_cycle()
         logger.info("✅ Test mode completed")
 
 def main():
@@ -149,10 +246,16 @@ def main():
     )
     args = parser.parse_args()
 
+    # Ensure logs directory exists; done here so importing this module has no
+    # filesystem side effects
+    Path('logs').mkdir(exist_ok=True)
+
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    bot = AffiliateBot(dry_run=args.dry_run)
+    # The dashboard runs in its own process with its own managers, so it
+    # doesn't need the bot or its agents
+    bot = None if args.command == 'dashboard' else AffiliateBot(dry_run=args.dry_run)
 
     if args.dry_run:
         logger.info("🧪 Dry run mode enabled via command line")
@@ -175,12 +278,21 @@ def main():
         elif args.command == 'dashboard':
             logger.info("🌐 Starting dashboard...")
             logger.info("Run: streamlit run dashboard/app.py")
-            import subprocess
-            subprocess.run([sys.executable, "-m", "streamlit", "run", "dashboard/app.py"])
+            streamlit_cmd = [sys.executable, "-m", "streamlit", "run", "dashboard/app.py"]
+            if os.name == 'nt':
+                # Windows has no real exec; os.execv would detach from the console
+                subprocess.run(streamlit_cmd)
+            else:
+                # Replace this interpreter with Streamlit rather than keeping it
+                # alive as an idle parent. exec skips atexit, so flush logs first.
+                shutdown_logging()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.execv(sys.executable, streamlit_cmd)
     except KeyboardInterrupt:
         logger.info("🛑 Stopped by user")
     except Exception as e:
-        logger.error(f"❌ An unexpected error occurred: {e}", exc_info=True)
+        logger.error("❌ An unexpected error occurred: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ Tests the fully functional implementation with dry-run mode.
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -59,10 +60,19 @@ def test_content_generation_agent():
         # Test individual content generation methods
         print("\n🔧 Testing individual content generation methods...")
 
+        # Each format is an independent LLM round-trip, so start all four at once
+        # and report on them in order as they complete
+        executor = ThreadPoolExecutor(max_workers=4)
+        blog_future = executor.submit(agent._generate_blog_post, sample_trend, sample_trend['content_ideas'][0])
+        twitter_future = executor.submit(agent._generate_twitter_thread, sample_trend, sample_trend['content_ideas'][1])
+        reddit_future = executor.submit(agent._generate_reddit_post, sample_trend, sample_trend['content_ideas'][2])
+        tiktok_future = executor.submit(agent._generate_tiktok_script, sample_trend, sample_trend['content_ideas'][0])
+        executor.shutdown(wait=False)
+
         # Test blog post generation
         print("\n📝 Testing blog post generation...")
         try:
-            blog_result = agent._generate_blog_post(sample_trend, sample_trend['content_ideas'][0])
+            blog_result = blog_future.result()
             if blog_result:
                 print(f"   ✅ Blog post generated: {blog_result['title'][:50]}...")
                 print(f"   📊 Word count: {blog_result.get('word_count', 0)}")
@@ -74,7 +84,7 @@ def test_content_generation_agent():
         # Test Twitter thread generation
         print("\n🐦 Testing Twitter thread generation...")
         try:
-            twitter_result = agent._generate_twitter_thread(sample_trend, sample_trend['content_ideas'][1])
+            twitter_result = twitter_future.result()
             if twitter_result:
                 print(f"   ✅ Twitter thread generated: {twitter_result['title'][:50]}...")
                 print(f"   📊 Tweet count: {len(twitter_result.get('tweets', []))}")
@@ -86,7 +96,7 @@ def test_content_generation_agent():
         # Test Reddit post generation
         print("\n🔴 Testing Reddit post generation...")
         try:
-            reddit_result = agent._generate_reddit_post(sample_trend, sample_trend['content_ideas'][2])
+            reddit_result = reddit_future.result()
             if reddit_result:
                 print(f"   ✅ Reddit post generated: {reddit_result['title'][:50]}...")
                 print(f"   📊 Word count: {reddit_result.get('word_count', 0)}")
@@ -98,7 +108,7 @@ def test_content_generation_agent():
         # Test TikTok script generation
         print("\n🎵 Testing TikTok script generation...")
         try:
-            tiktok_result = agent._generate_tiktok_script(sample_trend, sample_trend['content_ideas'][0])
+            tiktok_result = tiktok_future.result()
             if tiktok_result:
                 print(f"   ✅ TikTok script generated: {tiktok_result['title'][:50]}...")
                 print(f"   📊 Duration: {tiktok_result.get('duration', 'Unknown')}")
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Test script for DatabaseManager
+Covers connection handling, concurrency and schema migrations against
+throwaway in-memory and file databases.
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils.database import DatabaseManager
+
+# Seconds to wait before treating a database call as deadlocked
+_DEADLOCK_TIMEOUT = 10
+
+# Schema as created by the original DatabaseManager, before any migrations
+_BASELINE_SCHEMA = '''
+    CREATE TABLE trends (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        city TEXT NOT NULL,
+        trend_data TEXT NOT NULL,
+        content_ideas TEXT NOT NULL,
+        keywords TEXT NOT NULL,
+        status TEXT DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE content (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trend_id INTEGER,
+        content_type TEXT NOT NULL,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        seo_keywords TEXT,
+        affiliate_links TEXT,
+        images TEXT,
+        status TEXT DEFAULT 'draft',
+        quality_score REAL DEFAULT 0.0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (trend_id) REFERENCES trends (id)
+    );
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_id INTEGER NOT NULL,
+        platform TEXT NOT NULL,
+        platform_post_id TEXT,
+        post_url TEXT,
+        scheduled_at TIMESTAMP,
+        posted_at TIMESTAMP,
+        status TEXT DEFAULT 'scheduled',
+        error_message TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (content_id) REFERENCES content (id)
+    );
+    CREATE TABLE analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        metric_type TEXT NOT NULL,
+        metric_value REAL NOT NULL,
+        date DATE NOT NULL,
+        source TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (post_id) REFERENCES posts (id)
+    );
+    CREATE TABLE performance_summary (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL UNIQUE,
+        total_posts INTEGER DEFAULT 0,
+        total_views INTEGER DEFAULT 0,
+        total_clicks INTEGER DEFAULT 0,
+        total_conversions INTEGER DEFAULT 0,
+        estimated_revenue REAL DEFAULT 0.0,
+        click_rate REAL DEFAULT 0.0,
+        conversion_rate REAL DEFAULT 0.0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_trends_date ON trends (date);
+    CREATE INDEX idx_trends_city ON trends (city);
+    CREATE INDEX idx_content_status ON content (status);
+    CREATE INDEX idx_posts_platform ON posts (platform);
+    CREATE INDEX idx_posts_status ON posts (status);
+    CREATE INDEX idx_analytics_date ON analytics (date);
+
+    INSERT INTO trends (date, city, trend_data, content_ideas, keywords) VALUES
+        ('2025-01-01', 'Austin', '{}', '[]', '["budget hotels", "austin stays"]'),
+        ('2025-01-02', 'Nashville', '{}', '[]', '["music row", "budget hotels"]'),
+        ('2025-01-03', 'Savannah', '{}', '[]', '[]');
+    INSERT INTO content (trend_id, content_type, title, content, seo_keywords, status) VALUES
+        (1, 'blog_post', 'Austin on a budget', 'Body', '["budget", "austin"]', 'posted'),
+        (2, 'twitter_thread', 'Nashville nights', 'Body', '["nashville"]', 'ready');
+    INSERT INTO posts (content_id, platform, status, scheduled_at, created_at) VALUES
+        (1, 'medium', 'posted', NULL, '2025-01-05 10:00:00'),
+        (1, 'twitter', 'failed', NULL, '2025-01-05 11:00:00'),
+        (2, 'twitter', 'posted', NULL, '2025-01-05 12:00:00'),
+        (2, 'reddit', 'scheduled', '2025-01-07 09:00:00', '2025-01-06 08:00:00');
+    INSERT INTO analytics (post_id, metric_type, metric_value, date, source) VALUES
+        (1, 'views', 120, '2025-01-05', 'medium'),
+        (1, 'clicks', 7, '2025-01-05', 'bitly'),
+        (3, 'views', 40, '2025-01-05', 'twitter');
+    DELETE FROM analytics WHERE id = 2;
+    INSERT INTO performance_summary (date, total_posts, total_views, total_clicks) VALUES
+        ('2025-01-05', 3, 160, 7);
+'''
+
+
+def _run_with_timeout(target, timeout: float = _DEADLOCK_TIMEOUT):
+    """Run target on a daemon thread, failing if it does not finish in time."""
+    errors = []
+
+    def run():
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "database call deadlocked"
+    if errors:
+        raise errors[0]
+
+
+def _create_baseline_database(db_path: str):
+    """Create a database file with the original schema and some sample rows."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(_BASELINE_SCHEMA)
+    finally:
+        conn.close()
+
+
+def _for_each_database(test):
+    """Run a test against an in-memory and a file-backed database."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for db_path in (':memory:', str(Path(tmp_dir) / 'test.db')):
+            db = DatabaseManager(db_path)
+            try:
+                test(db)
+            finally:
+                db.close()
+
+
+def _insert_scheduled_post(db: DatabaseManager, platform: str = 'twitter') -> int:
+    """Insert a trend, its content and a scheduled post, returning the post ID."""
+    trend_id = db.insert_trend('Austin', {}, [], ['budget hotels'])
+    content_id = db.insert_content(trend_id, 'twitter_thread', 'Austin stays', 'Body')
+    return db.insert_post(content_id, platform, '2025-01-01T09:00:00')
+
+
+def test_write_while_iterating_scheduled_posts():
+    """Writes made while iterating scheduled posts must not deadlock."""
+    def check(db):
+        post_ids = [_insert_scheduled_post(db) for _ in range(3)]
+
+        def iterate_and_update():
+            for post in db.iter_scheduled_posts():
+                db.update_post_status(post['id'], 'posted', platform_post_id='p1')
+
+        _run_with_timeout(iterate_and_update)
+        assert db.get_scheduled_posts() == []
+        assert db.get_recent_post_count('twitter', hours=24) == len(post_ids)
+
+    _for_each_database(check)
+
+
+def test_concurrent_reads_and_writes():
+    """Threads mixing reads and writes neither deadlock nor lose rows."""
+    thread_count, iterations = 8, 25
+
+    def check(db):
+        def worker(worker_id: int):
+            for i in range(iterations):
+                trend_id = db.insert_trend(f"City {worker_id}", {'i': i}, [], [f"kw{worker_id}"])
+                db.get_pending_trends(limit=5)
+                db.insert_analytics(worker_id, 'views', float(i))
+                db.get_performance_summary(days=7)
+                db.update_trend_status(trend_id, 'processed')
+                db.get_trend_keywords(trend_id)
+
+        def run_workers():
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        _run_with_timeout(run_workers, timeout=60)
+        with db.read_connection() as conn:
+            assert conn.execute('SELECT COUNT(*) FROM trends').fetchone()[0] == thread_count * iterations
+            assert conn.execute('SELECT COUNT(*) FROM analytics').fetchone()[0] == thread_count * iterations
+            assert conn.execute("SELECT COUNT(*) FROM trends WHERE status = 'processed'").fetchone()[0] == \
+                thread_count * iterations
+        assert db.get_pending_trends() == []
+
+    _for_each_database(check)
+
+
+def test_read_inside_write():
+    """Reading from inside a write block on the same thread does not deadlock."""
+    def check(db):
+        def read_inside_write():
+            with db.write_connection() as conn:
+                conn.execute(
+                    "INSERT INTO trends (date, city, trend_data, content_ideas, keywords) "
+                    "VALUES ('2025-01-01', 'Austin', '{}', '[]', '[]')"
+                )
+                # File databases read the last committed snapshot; the memory
+                # database shares the writer's connection and sees the row
+                db.get_pending_trends()
+                db.get_scheduled_posts()
+
+        _run_with_timeout(read_inside_write)
+        assert len(db.get_pending_trends()) == 1
+
+    _for_each_database(check)
+
+
+def test_write_during_read():
+    """Writing while a read cursor is still open does not deadlock."""
+    def check(db):
+        for _ in range(3):
+            db.insert_trend('Austin', {}, [], ['budget hotels'])
+
+        def write_during_read():
+            with db.read_connection() as conn:
+                for trend_id, in conn.execute('SELECT id FROM trends').fetchall():
+                    db.update_trend_status(trend_id, 'processed')
+                    db.insert_analytics(trend_id, 'views', 1.0)
+
+        _run_with_timeout(write_during_read)
+        assert db.get_pending_trends() == []
+
+    _for_each_database(check)
+
+
+def test_nested_write_rolls_back_alone():
+    """A failed nested write undoes only its own changes."""
+    def check(db):
+        def nested_write():
+            with db.write_connection():
+                outer_id = db.insert_trend('Austin', {}, [], ['outer'])
+                try:
+                    with db.write_connection():
+                        db.insert_trend('Nashville', {}, [], ['inner'])
+                        raise ValueError("inner write failed")
+                except ValueError:
+                    pass
+            return outer_id
+
+        _run_with_timeout(nested_write)
+        assert [trend['city'] for trend in db.get_pending_trends()] == ['Austin']
+        assert db.find_trends_by_keyword('inner') == []
+
+        # A failed outer write is discarded entirely
+        try:
+            with db.write_connection():
+                db.insert_trend('Savannah', {}, [], [])
+                raise ValueError("outer write failed")
+        except ValueError:
+            pass
+        assert [trend['city'] for trend in db.get_pending_trends()] == ['Austin']
+
+    _for_each_database(check)
+
+
+def test_baseline_tables_are_rebuilt():
+    """analytics and performance_summary move onto their current definitions."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / 'baseline.db')
+        _create_baseline_database(db_path)
+
+        db = DatabaseManager(db_path)
+        try:
+            with db.read_connection() as conn:
+                table_sql = dict(conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
+                ).fetchall())
+                analytics = [tuple(row) for row in conn.execute(
+                    'SELECT id, post_id, metric_type, metric_value FROM analytics ORDER BY id'
+                )]
+                summary = [tuple(row) for row in conn.execute(
+                    'SELECT date, total_posts, total_views, total_clicks FROM performance_summary'
+                )]
+                index_names = {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'analytics'"
+                )}
+
+            assert 'AUTOINCREMENT' not in table_sql['analytics'].upper()
+            assert 'WITHOUT ROWID' in table_sql['performance_summary'].upper()
+            assert 'analytics_new' not in table_sql and 'performance_summary_new' not in table_sql
+            # Rows and their IDs survive the rebuild, gaps included
+            assert analytics == [(1, 1, 'views', 120.0), (3, 3, 'views', 40.0)]
+            assert summary == [('2025-01-05', 3, 160, 7)]
+            assert {'idx_analytics_date', 'idx_analytics_post_metric'} <= index_names
+
+            # The tracking agent's daily upsert still replaces by date
+            with db.write_connection() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO performance_summary (date, total_posts) VALUES (?, ?)',
+                    ('2025-01-05', 4)
+                )
+            db.insert_analytics(3, 'clicks', 2.0)
+            with db.read_connection() as conn:
+                assert conn.execute('SELECT total_posts FROM performance_summary').fetchone()[0] == 4
+                assert conn.execute('SELECT MAX(id) FROM analytics').fetchone()[0] == 4
+        finally:
+            db.close()
+
+        # Reopening does not rebuild again
+        db = DatabaseManager(db_path)
+        try:
+            with db.read_connection() as conn:
+                assert conn.execute('SELECT COUNT(*) FROM analytics').fetchone()[0] == 3
+        finally:
+            db.close()
+
+
+def _daily_post_stats_from_posts(conn) -> list:
+    """Recompute the daily posting rollup straight from the posts table."""
+    return [tuple(row) for row in conn.execute('''
+        SELECT DATE(created_at), platform, COUNT(*),
+               SUM(CASE WHEN status = 'posted' THEN 1 ELSE 0 END)
+        FROM posts
+        GROUP BY DATE(created_at), platform
+        ORDER BY 1, 2
+    ''')]
+
+
+def test_baseline_database_is_migrated():
+    """Opening a baseline database backfills every derived table and column."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / 'baseline.db')
+        _create_baseline_database(db_path)
+
+        db = DatabaseManager(db_path)
+        try:
+            with db.read_connection() as conn:
+                stats = [tuple(row) for row in conn.execute(
+                    'SELECT date, platform, posts, successful FROM daily_post_stats ORDER BY 1, 2'
+                )]
+                assert stats == _daily_post_stats_from_posts(conn)
+                assert ('2025-01-05', 'twitter', 2, 1) in stats
+
+                trend_keywords = [tuple(row) for row in conn.execute(
+                    'SELECT trend_id, keyword FROM trend_keywords ORDER BY 1, 2'
+                )]
+                expected = [tuple(row) for row in conn.execute(
+                    'SELECT trends.id, keyword.value FROM trends, json_each(trends.keywords) AS keyword ORDER BY 1, 2'
+                )]
+                assert trend_keywords == expected
+                assert len(trend_keywords) == 4
+
+                content_keywords = [tuple(row) for row in conn.execute(
+                    'SELECT content_id, keyword FROM content_keywords ORDER BY 1, 2'
+                )]
+                assert content_keywords == [(1, 'austin'), (1, 'budget'), (2, 'nashville')]
+
+                primary_keywords = [tuple(row) for row in conn.execute(
+                    'SELECT id, primary_keyword FROM trends ORDER BY id'
+                )]
+                assert primary_keywords == [(1, 'budget hotels'), (2, 'music row'), (3, None)]
+
+                denormalized = [tuple(row) for row in conn.execute('''
+                    SELECT p.title, p.content_type, c.title, c.content_type
+                    FROM posts p JOIN content c ON c.id = p.content_id
+                ''')]
+                assert denormalized and all(row[:2] == row[2:] for row in denormalized)
+
+            assert [trend['city'] for trend in db.find_trends_by_keyword('budget hotels')] == ['Nashville', 'Austin']
+            assert [trend['city'] for trend in db.find_trends_by_primary_keyword('music row')] == ['Nashville']
+            assert [post['title'] for post in db.get_scheduled_posts('reddit')] == ['Nashville nights']
+
+            # The triggers keep the rollup in step with later writes
+            db.update_post_status(4, 'posted', platform_post_id='r1')
+            db.insert_post(1, 'reddit')
+            with db.read_connection() as conn:
+                stats = [tuple(row) for row in conn.execute(
+                    'SELECT date, platform, posts, successful FROM daily_post_stats '
+                    'WHERE posts > 0 ORDER BY 1, 2'
+                )]
+                assert stats == _daily_post_stats_from_posts(conn)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
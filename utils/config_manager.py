@@ -6,18 +6,64 @@ Handles loading, validation, and management of system configuration.
 import os
 import yaml
 import logging
-from pathlib import Path
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any
 from dotenv import load_dotenv
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Environment variables read into the default configuration, with their fallbacks
+_ENV_DEFAULTS = {
+    'OPENAI_API_KEY': '',
+    'ANTHROPIC_API_KEY': '',
+    'TWITTER_BEARER_TOKEN': '',
+    'TWITTER_API_KEY': '',
+    'TWITTER_API_SECRET': '',
+    'TWITTER_ACCESS_TOKEN': '',
+    'TWITTER_ACCESS_TOKEN_SECRET': '',
+    'MEDIUM_ACCESS_TOKEN': '',
+    'REDDIT_CLIENT_ID': '',
+    'REDDIT_CLIENT_SECRET': '',
+    'REDDIT_USER_AGENT': 'AirbnbAffiliateBot/1.0',
+    'BITLY_ACCESS_TOKEN': '',
+    'UNSPLASH_ACCESS_KEY': '',
+    'AIRBNB_AFFILIATE_LINK': 'https://www.airbnb.com/',
+    'SENDER_EMAIL': '',
+    'SENDER_PASSWORD': '',
+    'RECIPIENT_EMAIL': '',
+    'MEDIUM_PUBLICATION_ID': '',
+}
+
+# Dotted config paths that must be set
+_REQUIRED_KEYS = (
+    'api_keys.openai_api_key',
+    'affiliate.airbnb_affiliate_link',
+)
+
+# Config key holding the credential that marks each service as configured
+_API_KEY_MAP = {
+    'openai': 'api_keys.openai_api_key',
+    'anthropic': 'api_keys.anthropic_api_key',
+    'twitter': 'api_keys.twitter_api_key',
+    'medium': 'api_keys.medium_access_token',
+    'reddit': 'api_keys.reddit_client_id',
+    'bitly': 'api_keys.bitly_access_token',
+    'unsplash': 'api_keys.unsplash_access_key',
+}
+
 
 class ConfigManager:
     """Manages system configuration from YAML files and environment variables."""
     
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize configuration manager."""
-        self.config_path = Path(config_path)
+        self.config_path = os.fspath(config_path)
         self.config = {}
+        self._configured_services: frozenset = frozenset()
         self.logger = logging.getLogger(__name__)
         
         # Load environment variables
@@ -30,38 +76,47 @@ class ConfigManager:
     def _load_config(self):
         """Load configuration from YAML file."""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    self.config = yaml.safe_load(f) or {}
-                self.logger.info(f"Configuration loaded from {self.config_path}")
-            else:
-                self.logger.warning(f"Configuration file not found: {self.config_path}")
-                self.config = self._get_default_config()
-                self._save_default_config()
+            self.config = self._read_config_file()
+            self.logger.info(f"Configuration loaded from {self.config_path}")
+        except FileNotFoundError:
+            self.logger.warning(f"Configuration file not found: {self.config_path}")
+            self.config = self._get_default_config()
+            self._save_default_config()
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
             self.config = self._get_default_config()
     
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Read and parse the YAML config.
+        
+        Raises FileNotFoundError if the config file does not exist.
+        """
+        # One bulk read; the loader detects the encoding from the raw bytes
+        with open(self.config_path, 'rb') as f:
+            raw = f.read()
+        return yaml.load(raw, Loader=_YamlLoader) or {}
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration structure."""
+        env = {key: os.environ.get(key, default) for key, default in _ENV_DEFAULTS.items()}
         return {
             'api_keys': {
-                'openai_api_key': os.getenv('OPENAI_API_KEY', ''),
-                'anthropic_api_key': os.getenv('ANTHROPIC_API_KEY', ''),
-                'twitter_bearer_token': os.getenv('TWITTER_BEARER_TOKEN', ''),
-                'twitter_api_key': os.getenv('TWITTER_API_KEY', ''),
-                'twitter_api_secret': os.getenv('TWITTER_API_SECRET', ''),
-                'twitter_access_token': os.getenv('TWITTER_ACCESS_TOKEN', ''),
-                'twitter_access_token_secret': os.getenv('TWITTER_ACCESS_TOKEN_SECRET', ''),
-                'medium_access_token': os.getenv('MEDIUM_ACCESS_TOKEN', ''),
-                'reddit_client_id': os.getenv('REDDIT_CLIENT_ID', ''),
-                'reddit_client_secret': os.getenv('REDDIT_CLIENT_SECRET', ''),
-                'reddit_user_agent': os.getenv('REDDIT_USER_AGENT', 'AirbnbAffiliateBot/1.0'),
-                'bitly_access_token': os.getenv('BITLY_ACCESS_TOKEN', ''),
-                'unsplash_access_key': os.getenv('UNSPLASH_ACCESS_KEY', ''),
+                'openai_api_key': env['OPENAI_API_KEY'],
+                'anthropic_api_key': env['ANTHROPIC_API_KEY'],
+                'twitter_bearer_token': env['TWITTER_BEARER_TOKEN'],
+                'twitter_api_key': env['TWITTER_API_KEY'],
+                'twitter_api_secret': env['TWITTER_API_SECRET'],
+                'twitter_access_token': env['TWITTER_ACCESS_TOKEN'],
+                'twitter_access_token_secret': env['TWITTER_ACCESS_TOKEN_SECRET'],
+                'medium_access_token': env['MEDIUM_ACCESS_TOKEN'],
+                'reddit_client_id': env['REDDIT_CLIENT_ID'],
+                'reddit_client_secret': env['REDDIT_CLIENT_SECRET'],
+                'reddit_user_agent': env['REDDIT_USER_AGENT'],
+                'bitly_access_token': env['BITLY_ACCESS_TOKEN'],
+                'unsplash_access_key': env['UNSPLASH_ACCESS_KEY'],
             },
             'affiliate': {
-                'airbnb_affiliate_link': os.getenv('AIRBNB_AFFILIATE_LINK', 'https://www.airbnb.com/'),
+                'airbnb_affiliate_link': env['AIRBNB_AFFILIATE_LINK'],
                 'commission_rate': 0.03,  # 3% estimated conversion rate
                 'avg_booking_value': 150.0,  # Average booking value in USD
             },
@@ -102,14 +157,14 @@ class ConfigManager:
             'email': {
                 'smtp_server': 'smtp.gmail.com',
                 'smtp_port': 587,
-                'sender_email': os.getenv('SENDER_EMAIL', ''),
-                'sender_password': os.getenv('SENDER_PASSWORD', ''),
-                'recipient_email': os.getenv('RECIPIENT_EMAIL', ''),
+                'sender_email': env['SENDER_EMAIL'],
+                'sender_password': env['SENDER_PASSWORD'],
+                'recipient_email': env['RECIPIENT_EMAIL'],
             },
             'social_platforms': {
                 'medium': {
                     'enabled': True,
-                    'publication_id': os.getenv('MEDIUM_PUBLICATION_ID', ''),
+                    'publication_id': env['MEDIUM_PUBLICATION_ID'],
                     'tags': ['Travel', 'Airbnb', 'Budget Travel', 'Hidden Gems', '2025']
                 },
                 'twitter': {
@@ -133,28 +188,31 @@ class ConfigManager:
     def _save_default_config(self):
         """Save default configuration to file."""
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(os.path.dirname(self.config_path) or '.', exist_ok=True)
             with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                yaml.dump(self.config, f, Dumper=_YamlDumper, default_flow_style=False, indent=2)
             self.logger.info(f"Default configuration saved to {self.config_path}")
         except Exception as e:
             self.logger.error(f"Failed to save default configuration: {e}")
     
     def _validate_config(self):
         """Validate configuration and warn about missing required fields."""
-        required_keys = [
-            'api_keys.openai_api_key',
-            'affiliate.airbnb_affiliate_link',
-        ]
-        
-        missing_keys = []
-        for key_path in required_keys:
-            if not self._get_nested_value(key_path):
-                missing_keys.append(key_path)
+        missing_keys = [key_path for key_path in _REQUIRED_KEYS if not self._get_nested_value(key_path)]
         
         if missing_keys:
             self.logger.warning(f"Missing required configuration keys: {missing_keys}")
             self.logger.warning("Please update config/config.yaml or set environment variables")
+        
+        self._refresh_configured_services()
+    
+    def _refresh_configured_services(self):
+        """Precompute the set of services with credentials configured."""
+        configured = []
+        for service, key_path in _API_KEY_MAP.items():
+            api_key = self._get_nested_value(key_path)
+            if isinstance(api_key, str) and api_key.strip():
+                configured.append(service)
+        self._configured_services = frozenset(configured)
     
     def _get_nested_value(self, key_path: str) -> Any:
         """Get nested configuration value using dot notation."""
@@ -179,27 +237,23 @@ class ConfigManager:
     def update_config(self, updates: Dict[str, Any]):
         """Update configuration with new values."""
         self.config.update(updates)
+        self._refresh_configured_services()
         try:
             with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                yaml.dump(self.config, f, Dumper=_YamlDumper, default_flow_style=False, indent=2)
             self.logger.info("Configuration updated successfully")
         except Exception as e:
             self.logger.error(f"Failed to update configuration: {e}")
     
     def is_api_configured(self, service: str) -> bool:
         """Check if API credentials are configured for a service."""
-        api_key_map = {
-            'openai': 'api_keys.openai_api_key',
-            'anthropic': 'api_keys.anthropic_api_key',
-            'twitter': 'api_keys.twitter_api_key',
-            'medium': 'api_keys.medium_access_token',
-            'reddit': 'api_keys.reddit_client_id',
-            'bitly': 'api_keys.bitly_access_token',
-            'unsplash': 'api_keys.unsplash_access_key',
-        }
-        
-        if service not in api_key_map:
-            return False
-        
-        api_key = self.get(api_key_map[service])
-        return bool(api_key and api_key.strip())
+        return service in self._configured_services
+
+
+@lru_cache(maxsize=1)
+def get_config_manager(config_path: str = "config/config.yaml") -> ConfigManager:
+    """Get the process-wide configuration manager, loading it on first use.
+    
+    Call get_config_manager.cache_clear() to force a reload.
+    """
+    return ConfigManager(config_path)
@@ -3,15 +3,200 @@ Database Management System
 Handles SQLite database operations for storing trends, content, and analytics.
 """
 
+import os
+import queue
 import sqlite3
 import json
+import threading
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Tuple
 from contextlib import contextmanager
 
 from .logger import get_logger
 
+# Per-connection tuning; journal_mode=WAL is persistent and set at schema init
+_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',  # Safe with WAL, fewer fsyncs
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',  # Up to ~64MB page cache, grown on demand
+)
+
+# Only meaningful for databases backed by a file
+_FILE_PRAGMAS = (
+    'PRAGMA mmap_size=1073741824',  # Read pages via a 1GB memory map, no read syscalls
+)
+
+# The background checkpointer normally keeps the WAL small; commits only run
+# an inline checkpoint as a backstop once it reaches ~40MB (default ~4MB)
+_WRITER_FILE_PRAGMAS = (
+    'PRAGMA wal_autocheckpoint=10000',
+)
+
+# Seconds between background WAL checkpoints
+_CHECKPOINT_INTERVAL = 30
+
+_MEMORY_DB = ':memory:'
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# Idle connections kept open for reuse; more are opened on demand under load
+_POOL_SIZE = min(os.cpu_count() or 1, 4)
+
+# JSON columns are written compactly (no separator spaces, raw UTF-8) by one
+# shared encoder; decoding is unchanged for rows already stored
+_json_dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+_json_loads = json.JSONDecoder().decode
+
+# Table definitions shared by schema init and the rebuild migration; {table}
+# is the name to create
+_SQL_CREATE_ANALYTICS = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,  -- rowid alias; no sqlite_sequence write per insert
+        post_id INTEGER NOT NULL,
+        metric_type TEXT NOT NULL,  -- views, clicks, conversions, revenue
+        metric_value REAL NOT NULL,
+        date DATE NOT NULL,
+        source TEXT,  -- bitly, medium, twitter, etc.
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (post_id) REFERENCES posts (id)
+    )
+'''
+
+# Clustered on its natural key so the daily upsert touches a single B-tree
+_SQL_CREATE_PERFORMANCE_SUMMARY = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        date DATE NOT NULL PRIMARY KEY,
+        total_posts INTEGER DEFAULT 0,
+        total_views INTEGER DEFAULT 0,
+        total_clicks INTEGER DEFAULT 0,
+        total_conversions INTEGER DEFAULT 0,
+        estimated_revenue REAL DEFAULT 0.0,
+        click_rate REAL DEFAULT 0.0,
+        conversion_rate REAL DEFAULT 0.0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID
+'''
+
+# Statements run on every call, kept as constants so each connection's
+# statement cache prepares them once
+_SQL_INSERT_TREND = '''
+    INSERT INTO trends (date, city, trend_data, content_ideas, keywords)
+    VALUES (DATE('now', 'localtime'), ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_CONTENT = '''
+    INSERT INTO content (trend_id, content_type, title, content, seo_keywords,
+                       affiliate_links, images, quality_score, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'ready')
+'''
+
+_SQL_INSERT_TREND_KEYWORD = '''
+    INSERT OR IGNORE INTO trend_keywords (trend_id, keyword) VALUES (?, ?)
+'''
+
+_SQL_INSERT_CONTENT_KEYWORD = '''
+    INSERT OR IGNORE INTO content_keywords (content_id, keyword) VALUES (?, ?)
+'''
+
+# Copies the content's title and type onto the post so scheduled-post reads
+# need no join; a missing content row still inserts the post
+_SQL_INSERT_POST = '''
+    INSERT INTO posts (content_id, platform, scheduled_at, title, content_type)
+    SELECT new.content_id, new.platform, new.scheduled_at, c.title, c.content_type
+    FROM (SELECT ? AS content_id, ? AS platform, ? AS scheduled_at) AS new
+    LEFT JOIN content c ON c.id = new.content_id
+'''
+
+_SQL_INSERT_ANALYTICS = '''
+    INSERT INTO analytics (post_id, metric_type, metric_value, date, source)
+    VALUES (?, ?, ?, COALESCE(?, DATE('now', 'localtime')), ?)
+'''
+
+_SQL_PENDING_TRENDS = '''
+    SELECT * FROM trends
+    WHERE status = 'pending'
+    ORDER BY created_at ASC
+    LIMIT ?
+'''
+
+_SQL_READY_CONTENT = '''
+    SELECT * FROM content
+    WHERE status = 'ready'
+    ORDER BY quality_score DESC, created_at ASC
+    LIMIT ?
+'''
+
+_SQL_UPDATE_TREND_STATUS = '''
+    UPDATE trends SET status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+_SQL_UPDATE_CONTENT_STATUS = '''
+    UPDATE content SET status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+# Fixed text so the statement cache reuses one prepared statement; empty
+# optional values leave the stored column untouched
+_SQL_UPDATE_POST_STATUS = '''
+    UPDATE posts SET
+        status = ?,
+        platform_post_id = COALESCE(NULLIF(?, ''), platform_post_id),
+        post_url = COALESCE(NULLIF(?, ''), post_url),
+        error_message = COALESCE(NULLIF(?, ''), error_message),
+        posted_at = CASE WHEN ? = 'posted' THEN CURRENT_TIMESTAMP ELSE posted_at END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+
+
+def _decode_json_rows(cursor: sqlite3.Cursor, json_columns: Tuple[str, ...]) -> Iterator[Dict[str, Any]]:
+    """Yield row dicts from an executed cursor, decoding the named JSON columns."""
+    columns = [description[0] for description in cursor.description]
+    json_indexes = [columns.index(name) for name in json_columns]
+    # Work on plain tuples: avoids a dict(sqlite3.Row) conversion plus a
+    # dict lookup and store per decoded column
+    cursor.row_factory = None
+    # Step the cursor instead of fetchall() so only one raw row is alive
+    # alongside the decoded records
+    for row in cursor:
+        values = list(row)
+        for index in json_indexes:
+            values[index] = _json_loads(values[index] or '[]')
+        yield dict(zip(columns, values))
+
+def _run_checkpointer(conn: sqlite3.Connection, stop: threading.Event, logger):
+    """Checkpoint the WAL periodically on a dedicated connection."""
+    # Takes no reference to the DatabaseManager, so an unclosed manager can
+    # still be garbage collected and its finalizer stop this thread
+    try:
+        stopping = False
+        while not stopping:
+            # Wakes early on close() for one final pass, so the WAL does
+            # not keep growing between runs
+            stopping = stop.wait(_CHECKPOINT_INTERVAL)
+            try:
+                # PASSIVE never waits on readers or the writer, so commits
+                # rarely pay for checkpoints
+                conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+            except sqlite3.Error as e:
+                logger.error(f"WAL checkpoint failed: {e}")
+    finally:
+        conn.close()
+
+
+def _stop_checkpointer(stop: threading.Event, thread: threading.Thread):
+    """Signal the checkpointer thread and wait for its final pass."""
+    stop.set()
+    # A collection triggered on the checkpointer thread itself cannot join it
+    if thread is not threading.current_thread():
+        thread.join()
+
 
 class DatabaseManager:
     """Manages SQLite database operations for the Airbnb affiliate system."""
@@ -20,16 +205,51 @@ class DatabaseManager:
         """Initialize database manager."""
         self.db_path = Path(db_path)
         self.logger = get_logger(__name__)
+        self._in_memory = str(db_path) == _MEMORY_DB
+        self._pragmas = _CONNECTION_PRAGMAS if self._in_memory else _CONNECTION_PRAGMAS + _FILE_PRAGMAS
+        # Most recently returned connection first, so the warmest page cache is reused
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=_POOL_SIZE)
+        self._read_pool: queue.LifoQueue = queue.LifoQueue(maxsize=_POOL_SIZE)
+        self._write_lock = threading.Lock()
+        # The writer-locked connection the current thread is using, if any
+        self._local = threading.local()
+        if self._in_memory:
+            # A named shared-cache memory database, so every pooled connection
+            # sees the same data; the anchor connection keeps it alive
+            self._connect_target = f"file:airbnb_bot_{id(self)}?mode=memory&cache=shared"
+            self._memory_anchor = self._connect()
+        else:
+            self._connect_target = str(self.db_path)
 
         # Ensure data directory exists
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize database schema
         self._init_database()
 
+        self._stop_checkpointer = None
+        if not self._in_memory:
+            stop = threading.Event()
+            checkpointer = threading.Thread(
+                target=_run_checkpointer, args=(self._connect(), stop, self.logger),
+                name='sqlite-checkpointer', daemon=True
+            )
+            checkpointer.start()
+            # Runs on close(), when the manager is garbage collected, or at
+            # interpreter exit, whichever comes first; callers need not close()
+            self._stop_checkpointer = weakref.finalize(self, _stop_checkpointer, stop, checkpointer)
+
     def _init_database(self):
         """Initialize database schema with all required tables."""
-        with self.get_connection() as conn:
+        if not self._in_memory:
+            # WAL is persistent in the database file, so it only needs to be
+            # set once; readers no longer block the writer. The journal mode
+            # cannot change inside a transaction, so set it before BEGIN
+            with self._locked_connection() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+
+        with self.write_connection() as conn:
             cursor = conn.cursor()
 
             # Trends table
@@ -85,110 +305,411 @@ class DatabaseManager:
             ''')
 
             # Analytics table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS analytics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    post_id INTEGER NOT NULL,
-                    metric_type TEXT NOT NULL,  -- views, clicks, conversions, revenue
-                    metric_value REAL NOT NULL,
-                    date DATE NOT NULL,
-                    source TEXT,  -- bitly, medium, twitter, etc.
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (post_id) REFERENCES posts (id)
-                )
-            ''')
+            cursor.execute(_SQL_CREATE_ANALYTICS.format(table='analytics'))
 
             # Performance summary table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS performance_summary (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date DATE NOT NULL UNIQUE,
-                    total_posts INTEGER DEFAULT 0,
-                    total_views INTEGER DEFAULT 0,
-                    total_clicks INTEGER DEFAULT 0,
-                    total_conversions INTEGER DEFAULT 0,
-                    estimated_revenue REAL DEFAULT 0.0,
-                    click_rate REAL DEFAULT 0.0,
-                    conversion_rate REAL DEFAULT 0.0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            cursor.execute(_SQL_CREATE_PERFORMANCE_SUMMARY.format(table='performance_summary'))
+
+            # Databases created before these tables were retuned still have
+            # the AUTOINCREMENT analytics id and the rowid performance_summary
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('analytics', 'performance_summary')"
+            )
+            table_sql = {name: sql.upper() for name, sql in cursor.fetchall()}
+            if 'AUTOINCREMENT' in table_sql['analytics']:
+                self._rebuild_table(cursor, 'analytics', _SQL_CREATE_ANALYTICS)
+            if 'WITHOUT ROWID' not in table_sql['performance_summary']:
+                self._rebuild_table(cursor, 'performance_summary', _SQL_CREATE_PERFORMANCE_SUMMARY)
 
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_date ON trends (date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_city ON trends (city)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_status ON content (status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_status_created ON trends (status, created_at)')
+            # First keyword as a generated column, computed by SQLite's JSON
+            # functions in C so keyword filters never decode JSON in Python.
+            # ALTER keeps existing databases working; VIRTUAL columns can be
+            # added without rewriting the table
+            cursor.execute('PRAGMA table_xinfo(trends)')
+            if 'primary_keyword' not in {column[1] for column in cursor.fetchall()}:
+                cursor.execute('''
+                    ALTER TABLE trends ADD COLUMN primary_keyword TEXT
+                    GENERATED ALWAYS AS (
+                        CASE WHEN json_valid(keywords) THEN json_extract(keywords, '$[0]') END
+                    ) VIRTUAL
+                ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_trends_primary_keyword ON trends (primary_keyword)')
+            # Serves get_ready_content's filter and sort order in one index walk
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_content_status_score
+                ON content (status, quality_score DESC, created_at)
+            ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_content_status')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts (platform)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_status ON posts (status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_date ON analytics (date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_created ON content (created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_posted ON posts (posted_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_platform_posted ON posts (platform, posted_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at)')
+            # Covers the per-post metric sums in get_performance_summary, so the
+            # join never reads analytics table rows; supersedes the post_id index
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analytics_post_metric
+                ON analytics (post_id, metric_type, metric_value)
+            ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_analytics_post')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_content_id ON posts (content_id)')
+            # Partial index: only the few still-scheduled posts, in due order
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posts_status_scheduled
+                ON posts (status, scheduled_at) WHERE status = 'scheduled'
+            ''')
+            # Title and content type denormalized onto posts; older databases
+            # get the columns added and filled once from content
+            cursor.execute('PRAGMA table_info(posts)')
+            if 'title' not in {column[1] for column in cursor.fetchall()}:
+                cursor.execute('ALTER TABLE posts ADD COLUMN title TEXT')
+                cursor.execute('ALTER TABLE posts ADD COLUMN content_type TEXT')
+                cursor.execute('''
+                    UPDATE posts SET
+                        title = (SELECT title FROM content WHERE content.id = posts.content_id),
+                        content_type = (SELECT content_type FROM content WHERE content.id = posts.content_id)
+                ''')
+
+            self._init_daily_post_stats(cursor)
+            self._init_keyword_tables(cursor)
+
+            # Give the query planner statistics the first time; afterwards
+            # PRAGMA optimize on close keeps them current cheaply
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                cursor.execute('ANALYZE')
 
-            conn.commit()
             self.logger.info("Database schema initialized successfully")
 
-    @contextmanager
-    def get_connection(self):
-        """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path)
+    def _rebuild_table(self, cursor: sqlite3.Cursor, table: str, create_sql: str):
+        """Move a table onto a new definition: create it, copy the rows, swap it in.
+
+        Indexes on the old table are dropped with it; schema init recreates them.
+        """
+        new_table = f"{table}_new"
+        cursor.execute(f'DROP TABLE IF EXISTS {new_table}')
+        cursor.execute(create_sql.format(table=new_table))
+
+        cursor.execute(f'PRAGMA table_info({table})')
+        old_columns = {column[1] for column in cursor.fetchall()}
+        cursor.execute(f'PRAGMA table_info({new_table})')
+        columns = ', '.join(column[1] for column in cursor.fetchall() if column[1] in old_columns)
+
+        cursor.execute(f'INSERT INTO {new_table} ({columns}) SELECT {columns} FROM {table}')
+        cursor.execute(f'DROP TABLE {table}')
+        cursor.execute(f'ALTER TABLE {new_table} RENAME TO {table}')
+        self.logger.info(f"Rebuilt {table} table with its current schema")
+
+    def _init_daily_post_stats(self, cursor: sqlite3.Cursor):
+        """Create the per-day, per-platform posting rollup and the triggers that maintain it."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_post_stats'")
+        needs_backfill = cursor.fetchone() is None
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_post_stats (
+                date DATE NOT NULL,
+                platform TEXT NOT NULL,
+                posts INTEGER NOT NULL DEFAULT 0,
+                successful INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, platform)
+            )
+        ''')
+
+        # Keep the rollup in step with every write to posts
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_posts_daily_stats_insert
+            AFTER INSERT ON posts
+            BEGIN
+                INSERT INTO daily_post_stats (date, platform, posts, successful)
+                VALUES (DATE(NEW.created_at), NEW.platform, 1,
+                        CASE WHEN NEW.status = 'posted' THEN 1 ELSE 0 END)
+                ON CONFLICT (date, platform) DO UPDATE SET
+                    posts = posts + 1,
+                    successful = successful + excluded.successful;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_posts_daily_stats_update
+            AFTER UPDATE OF status, platform, created_at ON posts
+            BEGIN
+                UPDATE daily_post_stats SET
+                    posts = posts - 1,
+                    successful = successful - CASE WHEN OLD.status = 'posted' THEN 1 ELSE 0 END
+                WHERE date = DATE(OLD.created_at) AND platform = OLD.platform;
+                INSERT INTO daily_post_stats (date, platform, posts, successful)
+                VALUES (DATE(NEW.created_at), NEW.platform, 1,
+                        CASE WHEN NEW.status = 'posted' THEN 1 ELSE 0 END)
+                ON CONFLICT (date, platform) DO UPDATE SET
+                    posts = posts + 1,
+                    successful = successful + excluded.successful;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_posts_daily_stats_delete
+            AFTER DELETE ON posts
+            BEGIN
+                UPDATE daily_post_stats SET
+                    posts = posts - 1,
+                    successful = successful - CASE WHEN OLD.status = 'posted' THEN 1 ELSE 0 END
+                WHERE date = DATE(OLD.created_at) AND platform = OLD.platform;
+            END
+        ''')
+
+        # Seed the rollup from existing posts the first time it is created
+        if needs_backfill:
+            cursor.execute('''
+                INSERT INTO daily_post_stats (date, platform, posts, successful)
+                SELECT DATE(created_at), platform, COUNT(*),
+                       SUM(CASE WHEN status = 'posted' THEN 1 ELSE 0 END)
+                FROM posts
+                WHERE created_at IS NOT NULL
+                GROUP BY DATE(created_at), platform
+            ''')
+
+    def _init_keyword_tables(self, cursor: sqlite3.Cursor):
+        """Create the keyword child tables that mirror the JSON keyword lists."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trend_keywords'")
+        needs_backfill = cursor.fetchone() is None
+
+        # One row per (parent, keyword) so keyword lookups hit an index
+        # instead of decoding every JSON list in Python
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trend_keywords (
+                trend_id INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                PRIMARY KEY (trend_id, keyword)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_keywords (
+                content_id INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                PRIMARY KEY (content_id, keyword)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trend_keywords_keyword ON trend_keywords (keyword)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_keywords_keyword ON content_keywords (keyword)')
+
+        # Seed from the existing JSON columns the first time
+        if needs_backfill:
+            cursor.execute('''
+                INSERT OR IGNORE INTO trend_keywords (trend_id, keyword)
+                SELECT trends.id, keyword.value
+                FROM trends, json_each(trends.keywords) AS keyword
+                WHERE json_valid(trends.keywords) AND keyword.type = 'text'
+            ''')
+            cursor.execute('''
+                INSERT OR IGNORE INTO content_keywords (content_id, keyword)
+                SELECT content.id, keyword.value
+                FROM content, json_each(content.seo_keywords) AS keyword
+                WHERE json_valid(content.seo_keywords) AND keyword.type = 'text'
+            ''')
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new tuned connection for one of the pools."""
+        # Pooled connections move between threads, but only one thread uses
+        # a connection at a time
+        # Autocommit mode: the sqlite3 module no longer inspects each
+        # statement to open implicit transactions; write_connection()
+        # issues BEGIN/COMMIT itself
+        conn = sqlite3.connect(
+            self._connect_target,
+            uri=self._in_memory,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            isolation_level=None
+        )
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in self._pragmas:
+            conn.execute(pragma)
+        if read_only:
+            conn.execute('PRAGMA query_only=ON')
+        elif not self._in_memory:
+            for pragma in _WRITER_FILE_PRAGMAS:
+                conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _pooled_connection(self, pool: queue.LifoQueue, read_only: bool):
+        """Borrow a connection from a pool, returning it when done."""
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only)
+
         try:
             yield conn
-        finally:
+        except BaseException:
+            # Don't hand a possibly broken connection to the next caller
+            conn.close()
+            raise
+
+        if conn.in_transaction:
+            # Uncommitted work must not leak into the next borrower
+            conn.rollback()
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
             conn.close()
 
+    def get_connection(self):
+        """Borrow a pooled read-write database connection."""
+        return self._pooled_connection(self._pool, read_only=False)
+
+    @contextmanager
+    def _locked_connection(self):
+        """Borrow a read-write connection, holding the process-wide writer lock."""
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            # Nested use on the thread that already holds the lock; taking the
+            # non-reentrant lock again would deadlock, so share its connection
+            yield held
+            return
+
+        # SQLite allows one writer at a time; queueing writers here avoids
+        # lock-upgrade contention and busy errors between threads
+        with self._write_lock:
+            with self._pooled_connection(self._pool, read_only=False) as conn:
+                self._local.conn = conn
+                try:
+                    yield conn
+                finally:
+                    self._local.conn = None
+
+    @contextmanager
+    def write_connection(self):
+        """Borrow a read-write connection inside one write transaction.
+
+        The transaction commits when the block exits normally and is
+        discarded if it raises. Nested inside another write block on the same
+        thread, it runs as a savepoint of the outer transaction instead.
+        """
+        with self._locked_connection() as conn:
+            if conn.in_transaction:
+                conn.execute('SAVEPOINT nested_write')
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute('ROLLBACK TO nested_write')
+                    conn.execute('RELEASE nested_write')
+                    raise
+                conn.execute('RELEASE nested_write')
+                return
+
+            # IMMEDIATE takes the write lock up front instead of upgrading
+            # from a read lock mid-transaction
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            if conn.in_transaction:
+                conn.execute('COMMIT')
+
+    def read_connection(self):
+        """Borrow a query-only connection; under WAL readers never wait on the writer."""
+        if self._in_memory:
+            # Shared-cache memory databases use table-level locks instead of
+            # WAL, so concurrent readers would block writers; serialize instead
+            return self._locked_connection()
+        return self._pooled_connection(self._read_pool, read_only=True)
+
+    def close(self):
+        """Stop the checkpointer and close all idle pooled connections."""
+        if self._stop_checkpointer is not None:
+            self._stop_checkpointer()
+        for pool in (self._read_pool, self._pool):
+            while True:
+                try:
+                    conn = pool.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    if pool is self._pool:
+                        # Refresh planner statistics for tables this connection
+                        # queried (query-only readers cannot write them)
+                        conn.execute('PRAGMA optimize')
+                finally:
+                    conn.close()
+        if self._in_memory:
+            self._memory_anchor.close()
+
     def insert_trend(self, city: str, trend_data: Dict, content_ideas: List[str], keywords: List[str]) -> int:
         """Insert a new trend record."""
-        with self.get_connection() as conn:
+        with self.write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO trends (date, city, trend_data, content_ideas, keywords)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().date(),
+            cursor.execute(_SQL_INSERT_TREND, (
                 city,
-                json.dumps(trend_data),
-                json.dumps(content_ideas),
-                json.dumps(keywords)
+                _json_dumps(trend_data),
+                _json_dumps(content_ideas),
+                _json_dumps(keywords)
             ))
-            conn.commit()
             trend_id = cursor.lastrowid
+            cursor.executemany(_SQL_INSERT_TREND_KEYWORD, [(trend_id, keyword) for keyword in keywords])
             self.logger.info(f"Inserted trend record for {city} with ID {trend_id}")
             return trend_id
 
+    def insert_trends(self, trends: List[Dict[str, Any]]) -> List[int]:
+        """Insert multiple trend records in a single transaction."""
+        if not trends:
+            return []
+
+        rows = [
+            (
+                trend['city'],
+                _json_dumps(trend['trend_data']),
+                _json_dumps(trend['content_ideas']),
+                _json_dumps(trend['keywords'])
+            )
+            for trend in trends
+        ]
+
+        with self.write_connection() as conn:
+            cursor = conn.cursor()
+            trend_ids = []
+            # Single commit for the whole batch; lastrowid is read per row
+            # so callers still get each record's ID
+            keyword_rows = []
+            for row, trend in zip(rows, trends):
+                cursor.execute(_SQL_INSERT_TREND, row)
+                trend_ids.append(cursor.lastrowid)
+                keyword_rows.extend((cursor.lastrowid, keyword) for keyword in trend['keywords'])
+            cursor.executemany(_SQL_INSERT_TREND_KEYWORD, keyword_rows)
+            self.logger.info(f"Inserted {len(trend_ids)} trend records")
+            return trend_ids
+
     def insert_content(self, trend_id: int, content_type: str, title: str, content: str,
                       seo_keywords: List[str] = None, affiliate_links: List[str] = None,
                       images: List[str] = None, quality_score: float = 0.0) -> int:
         """Insert a new content record."""
-        with self.get_connection() as conn:
+        with self.write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO content (trend_id, content_type, title, content, seo_keywords,
-                                   affiliate_links, images, quality_score, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'ready')
-            ''', (
+            cursor.execute(_SQL_INSERT_CONTENT, (
                 trend_id,
                 content_type,
                 title,
                 content,
-                json.dumps(seo_keywords or []),
-                json.dumps(affiliate_links or []),
-                json.dumps(images or []),
+                _json_dumps(seo_keywords or []),
+                _json_dumps(affiliate_links or []),
+                _json_dumps(images or []),
                 quality_score
             ))
-            conn.commit()
             content_id = cursor.lastrowid
+            if seo_keywords:
+                cursor.executemany(_SQL_INSERT_CONTENT_KEYWORD,
+                                   [(content_id, keyword) for keyword in seo_keywords])
             self.logger.info(f"Inserted content record with ID {content_id}")
             return content_id
 
     def insert_post(self, content_id: int, platform: str, scheduled_at: datetime = None) -> int:
         """Insert a new post record."""
-        with self.get_connection() as conn:
+        with self.write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO posts (content_id, platform, scheduled_at)
-                VALUES (?, ?, ?)
-            ''', (content_id, platform, scheduled_at))
-            conn.commit()
+            cursor.execute(_SQL_INSERT_POST, (content_id, platform, scheduled_at))
             post_id = cursor.lastrowid
             self.logger.info(f"Inserted post record with ID {post_id}")
             return post_id
@@ -196,118 +717,146 @@ class DatabaseManager:
     def update_post_status(self, post_id: int, status: str, platform_post_id: str = None,
                           post_url: str = None, error_message: str = None):
         """Update post status and metadata."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            update_fields = ['status = ?', 'updated_at = CURRENT_TIMESTAMP']
-            values = [status]
-
-            if platform_post_id:
-                update_fields.append('platform_post_id = ?')
-                values.append(platform_post_id)
-
-            if post_url:
-                update_fields.append('post_url = ?')
-                values.append(post_url)
-
-            if error_message:
-                update_fields.append('error_message = ?')
-                values.append(error_message)
-
-            if status == 'posted':
-                update_fields.append('posted_at = CURRENT_TIMESTAMP')
-
-            values.append(post_id)
-
-            cursor.execute(f'''
-                UPDATE posts SET {', '.join(update_fields)}
-                WHERE id = ?
-            ''', values)
-            conn.commit()
+        with self.write_connection() as conn:
+            conn.execute(_SQL_UPDATE_POST_STATUS, (
+                status, platform_post_id, post_url, error_message, status, post_id
+            ))
             self.logger.info(f"Updated post {post_id} status to {status}")
 
     def get_pending_trends(self, limit: int = 10) -> List[Dict]:
         """Get pending trends for content generation."""
-        with self.get_connection() as conn:
+        with self.read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM trends
-                WHERE status = 'pending'
-                ORDER BY created_at ASC
-                LIMIT ?
-            ''', (limit,))
-
-            trends = []
-            for row in cursor.fetchall():
-                trend = dict(row)
-                trend['trend_data'] = json.loads(trend['trend_data'])
-                trend['content_ideas'] = json.loads(trend['content_ideas'])
-                trend['keywords'] = json.loads(trend['keywords'])
-                trends.append(trend)
+            cursor.execute(_SQL_PENDING_TRENDS, (limit,))
+            trends = list(_decode_json_rows(cursor, ('trend_data', 'content_ideas', 'keywords')))
 
             return trends
 
     def get_ready_content(self, limit: int = 10) -> List[Dict]:
         """Get content ready for posting."""
-        with self.get_connection() as conn:
+        with self.read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM content
-                WHERE status = 'ready'
-                ORDER BY quality_score DESC, created_at ASC
-                LIMIT ?
-            ''', (limit,))
-
-            content_items = []
-            for row in cursor.fetchall():
-                content = dict(row)
-                content['seo_keywords'] = json.loads(content['seo_keywords'] or '[]')
-                content['affiliate_links'] = json.loads(content['affiliate_links'] or '[]')
-                content['images'] = json.loads(content['images'] or '[]')
-                content_items.append(content)
+            cursor.execute(_SQL_READY_CONTENT, (limit,))
+            content_items = list(_decode_json_rows(cursor, ('seo_keywords', 'affiliate_links', 'images')))
 
             return content_items
 
+    def get_trend_keywords(self, trend_id: int) -> List[str]:
+        """Get a trend's keywords without decoding its JSON columns."""
+        with self.read_connection() as conn:
+            cursor = conn.execute(
+                'SELECT keyword FROM trend_keywords WHERE trend_id = ?', (trend_id,)
+            )
+            return [keyword for keyword, in cursor]
+
+    def find_trends_by_primary_keyword(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """Get the most recent trends whose first keyword matches."""
+        with self.read_connection() as conn:
+            cursor = conn.execute('''
+                SELECT id, date, city, status
+                FROM trends
+                WHERE primary_keyword = ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (keyword, limit))
+            return [dict(row) for row in cursor]
+
+    def find_trends_by_keyword(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """Get the most recent trends tagged with a keyword."""
+        with self.read_connection() as conn:
+            cursor = conn.execute('''
+                SELECT t.id, t.date, t.city, t.status
+                FROM trend_keywords k
+                JOIN trends t ON t.id = k.trend_id
+                WHERE k.keyword = ?
+                ORDER BY t.id DESC
+                LIMIT ?
+            ''', (keyword, limit))
+            return [dict(row) for row in cursor]
+
     def get_scheduled_posts(self, platform: str = None) -> List[Dict]:
         """Get scheduled posts for a platform."""
-        with self.get_connection() as conn:
+        return list(self.iter_scheduled_posts(platform))
+
+    def iter_scheduled_posts(self, platform: str = None) -> Iterator[Dict]:
+        """Yield scheduled posts for a platform one at a time.
+
+        For file databases the pooled connection is held until the iterator
+        is exhausted, so consume it promptly.
+        """
+        with self.read_connection() as conn:
             cursor = conn.cursor()
             query = '''
-                SELECT p.*, c.title, c.content_type
-                FROM posts p
-                JOIN content c ON p.content_id = c.id
-                WHERE p.status = 'scheduled'
+                SELECT * FROM posts
+                WHERE status = 'scheduled'
             '''
             params = []
 
             if platform:
-                query += ' AND p.platform = ?'
+                query += ' AND platform = ?'
                 params.append(platform)
 
-            query += ' ORDER BY p.scheduled_at ASC'
+            query += ' ORDER BY scheduled_at ASC'
 
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            if not self._in_memory:
+                for row in cursor:
+                    yield dict(row)
+                return
+
+            # Memory databases read under the writer lock, which must not be
+            # held across yields: a write made while iterating would deadlock
+            rows = cursor.fetchall()
+
+        for row in rows:
+            yield dict(row)
+
+    def get_recent_post_count(self, platform: str, hours: int = 1) -> int:
+        """Count posts published to a platform within the last N hours."""
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) FROM posts
+                WHERE platform = ? AND posted_at >= datetime('now', ?)
+            ''', (platform, f'-{hours} hours'))
+            return cursor.fetchone()[0]
 
     def insert_analytics(self, post_id: int, metric_type: str, metric_value: float,
                         date: datetime = None, source: str = None):
         """Insert analytics data."""
-        with self.get_connection() as conn:
+        with self.write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO analytics (post_id, metric_type, metric_value, date, source)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_SQL_INSERT_ANALYTICS, (
                 post_id,
                 metric_type,
                 metric_value,
-                (date or datetime.now()).date(),
+                date.date() if date is not None else None,
                 source
             ))
-            conn.commit()
+
+    def insert_analytics_bulk(self, rows: List[Tuple]) -> int:
+        """Insert many analytics rows in a single transaction.
+
+        Each row is (post_id, metric_type, metric_value, date, source); a
+        date of None means today.
+        """
+        if not rows:
+            return 0
+
+        params = [
+            (post_id, metric_type, metric_value,
+             date.date() if isinstance(date, datetime) else date, source)
+            for post_id, metric_type, metric_value, date, source in rows
+        ]
+
+        with self.write_connection() as conn:
+            conn.executemany(_SQL_INSERT_ANALYTICS, params)
+            self.logger.info(f"Inserted {len(params)} analytics records")
+            return len(params)
 
     def get_performance_summary(self, days: int = 30) -> Dict:
         """Get performance summary for the last N days."""
-        with self.get_connection() as conn:
+        with self.read_connection() as conn:
             cursor = conn.cursor()
             start_date = (datetime.now() - timedelta(days=days)).date()
 
@@ -341,11 +890,13 @@ class DatabaseManager:
 
     def update_trend_status(self, trend_id: int, status: str):
         """Update trend status."""
-        with self.get_connection() as conn:
+        with self.write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE trends SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, trend_id))
-            conn.commit()
-            self.logger.info(f"Updated trend {trend_id} status to {status}")
\ No newline at end of file
+            cursor.execute(_SQL_UPDATE_TREND_STATUS, (status, trend_id))
+            self.logger.info(f"Updated trend {trend_id} status to {status}")
+
+    def update_content_status(self, content_id: int, status: str):
+        """Update content status."""
+        with self.write_connection() as conn:
+            conn.execute(_SQL_UPDATE_CONTENT_STATUS, (status, content_id))
+            self.logger.info(f"Updated content {content_id} status to {status}")
\ No newline at end of file
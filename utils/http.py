@@ -0,0 +1,27 @@
+"""
+HTTP Session Management
+Provides a shared requests session so API calls reuse pooled keep-alive connections.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Get the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
@@ -3,17 +3,36 @@ Logging Configuration System
 Provides centralized logging setup with file rotation and formatting.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
+import re
 from pathlib import Path
 from typing import Optional
 
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+# File size strings such as "10MB", "500 KB" or "1048576"
+_FILE_SIZE_RE = re.compile(r'^\s*(\d+)\s*([KMG]?B)?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+# Background listener that writes queued log records to the real handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
     max_file_size: str = "10MB",
-    backup_count: int = 5
+    backup_count: int = 5,
+    buffer_capacity: int = 1024
 ) -> logging.Logger:
     """
     Setup centralized logging configuration.
@@ -23,18 +42,22 @@ def setup_logging(
         log_file: Path to log file (optional)
         max_file_size: Maximum log file size before rotation
         backup_count: Number of backup files to keep
+        buffer_capacity: Records buffered before a file write (0 disables buffering)
     
     Returns:
         Configured logger instance
     """
     # Convert log level string to logging constant
-    numeric_level = getattr(logging, log_level.upper(), logging.INFO)
+    numeric_level = _LEVELS.get(log_level.upper(), logging.INFO)
     
     # Create logger
     logger = logging.getLogger('airbnb_affiliate_bot')
     logger.setLevel(numeric_level)
     
-    # Clear existing handlers to avoid duplicates
+    # Clear existing handlers to avoid duplicates, flushing any buffered records
+    shutdown_logging()
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
     
     # Create formatter
@@ -47,7 +70,7 @@ def setup_logging(
     console_handler = logging.StreamHandler()
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler with rotation (if log_file specified)
     if log_file:
@@ -65,7 +88,30 @@ def setup_logging(
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        
+        if buffer_capacity > 0:
+            # Batch file writes; errors flush immediately and the buffer is
+            # flushed when logging shuts down at exit
+            memory_handler = logging.handlers.MemoryHandler(
+                capacity=buffer_capacity,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True
+            )
+            memory_handler.setLevel(numeric_level)
+            handlers.append(memory_handler)
+        else:
+            handlers.append(file_handler)
+    
+    # Callers only enqueue records; a background thread formats and writes
+    # them so logging never blocks on console or disk I/O
+    global _queue_listener
+    log_queue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -73,6 +119,22 @@ def setup_logging(
     return logger
 
 
+def shutdown_logging():
+    """Drain and stop the background log listener, closing its handlers."""
+    global _queue_listener
+    if _queue_listener is None:
+        return
+    
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        handler.close()
+    _queue_listener = None
+
+
+# Runs before logging's own shutdown hook, so queued records are written first
+atexit.register(shutdown_logging)
+
+
 def _parse_file_size(size_str: str) -> int:
     """
     Parse file size string to bytes.
@@ -83,18 +145,12 @@ def _parse_file_size(size_str: str) -> int:
     Returns:
         Size in bytes
     """
-    size_str = size_str.upper().strip()
+    match = _FILE_SIZE_RE.match(size_str)
+    if not match:
+        raise ValueError(f"Invalid file size: {size_str!r}")
     
-    # Extract number and unit
-    if size_str.endswith('KB'):
-        return int(size_str[:-2]) * 1024
-    elif size_str.endswith('MB'):
-        return int(size_str[:-2]) * 1024 * 1024
-    elif size_str.endswith('GB'):
-        return int(size_str[:-2]) * 1024 * 1024 * 1024
-    else:
-        # Assume bytes if no unit specified
-        return int(size_str)
+    # Assume bytes if no unit specified
+    return int(match.group(1)) * _SIZE_UNITS[(match.group(2) or '').upper()]
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -110,13 +166,21 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f'airbnb_affiliate_bot.{name}')
 
 
+class _ClassLogger:
+    """Descriptor that creates a class's logger once and memoizes it on that class."""
+    
+    def __get__(self, obj, owner) -> logging.Logger:
+        logger = owner.__dict__.get('_class_logger')
+        if logger is None:
+            logger = get_logger(owner.__name__)
+            owner._class_logger = logger
+        return logger
+
+
 class LoggerMixin:
     """Mixin class to add logging capability to any class."""
     
-    @property
-    def logger(self) -> logging.Logger:
-        """Get logger for this class."""
-        return get_logger(self.__class__.__name__)
+    logger = _ClassLogger()
 
 
 # Example usage and testing